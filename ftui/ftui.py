@@ -20,9 +20,12 @@ Run with:
 import argparse
 import logging
 import sys
-from datetime import datetime, timedelta, timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from time import monotonic, time
 
-import pandas as pd
 from textual import work
 from textual.app import App
 from textual.logging import TextualHandler
@@ -30,6 +33,14 @@ from textual.reactive import reactive, var
 
 import ftui.ftui_client as ftuic
 import ftui.ftui_helpers as fth
+from ftui.ftui_alerts import AlertEngine
+from ftui.ftui_daemon import AggregatorDaemon, RemoteEngine, adopt_daemon_bots
+from ftui.ftui_engine import DataEngine
+from ftui.ftui_fleet import FleetPairPerformance, FleetTradeIndex, FleetTradeView
+from ftui.ftui_frames import FRAME_BUILDERS
+from ftui.ftui_series import FleetEquity, FleetProfitSeries, OpenProfitHistory
+from ftui.ftui_session import SessionRecorder, SessionReplay
+from ftui.ftui_subscriptions import DataSubscriptions
 from ftui.screens.dashboard_screen import DashboardScreen
 from ftui.screens.help_screen import HelpScreen
 from ftui.screens.main_bot_screen import MainBotScreen
@@ -53,6 +64,8 @@ asyncio_logger.removeHandler(sys.stdout)
 asyncio_logger.removeHandler(sys.stderr)
 asyncio_logger.addHandler(TextualHandler())
 
+logger = logging.getLogger("ftui")
+
 args = None
 
 
@@ -74,7 +87,8 @@ class FreqText(App):
 
     show_clients = var(True)
     active_tab = reactive("open-trades-tab")
-    updating = False
+    # held by the periodic refresh, so a tick finding one still running skips
+    update_lock = threading.Lock()
     last_update = None
 
     settings = {}
@@ -83,6 +97,17 @@ class FreqText(App):
     client_dict = {}
     clients_disabled = set()
     client_dfs = {}
+    fleet_profit = FleetProfitSeries()
+    fleet_equity = FleetEquity()
+    fleet_index = FleetTradeIndex()
+    fleet_pairs = FleetPairPerformance()
+    open_profit_history = OpenProfitHistory()
+    data_subscriptions = DataSubscriptions()
+    engine = None
+    alerts = None
+
+    # data fetched this recently is not fetched again when a view subscribes to it
+    DATA_FRESH_FOR = 5
 
     DFMT = "%Y-%m-%d %H:%M:%S"
     TZFMT = "%Y-%m-%d %H:%M:%S%z"
@@ -111,6 +136,8 @@ class FreqText(App):
 
     def set_client_dict(self, client_dict):
         self.client_dict = client_dict
+        # one per bot, held while its data is fetched and applied
+        self.client_locks = {name: threading.Lock() for name in client_dict}
 
     def set_settings(self, args):
         self.settings = args
@@ -118,6 +145,9 @@ class FreqText(App):
         if self.settings.colours:
             self.set_colours(self.settings.colours)
 
+        if self.settings.alerts:
+            self.alerts = AlertEngine.from_config(self.settings.alerts)
+
     def set_colours(self, colours):
         self.COLOURS.set_colours(colours)
 
@@ -126,276 +156,199 @@ class FreqText(App):
 
         self.update_five_sec_render = self.set_interval(5, self.update_per_five_sec)
 
-    async def update_per_five_sec(self):
-        self.update_all_dfs()
-
-    def _get_open_trade_dataframe(self, ftuic):
-        row_data = []
-
-        trades = ftuic.get_open_trades()
-        if trades is not None:
-            for t in trades:
-                otime = datetime.strptime(f"{t['open_date']}+00:00", self.app.TZFMT)
-                ctime = datetime.now(tz=timezone.utc)
-
-                open_orders = (
-                    t["has_open_orders"]
-                    if "has_open_orders" in t
-                    else (t["open_order_id"] is not None)
-                )
-
-                num_orders = len(t["orders"]) if "orders" in t else 0
-
-                suff = ""
-                if open_orders and t["close_rate_requested"] is None:
-                    suff = " *"
-
-                if t["close_rate_requested"] is not None:
-                    suff = " **"
-
-                pairstr = f"{t['pair']}{suff}"
-                rpfta = round(float(t["profit_abs"]), 2)
-                t_dir = "S" if t["is_short"] else "L"
-                stop_profit = round(t['stop_loss_pct'], 2)
-
-                max_profit = 0
-
-                if num_orders == 1:
-                    if t["max_rate"] is not None and t['max_rate'] != 0:
-                        max_profit = round(
-                            ((t["max_rate"] - t["open_rate"]) / t["max_rate"]) * 100, 2
-                        )
-                elif num_orders > 1:
-                    max_profits = []
-                    for o in t["orders"]:
-                        if t["max_rate"] is not None and t["max_rate"] != 0:
-                            max_profit_o = round(
-                                ((t["max_rate"] - o["safe_price"]) / o["safe_price"]) * 100, 2
-                            )
-                            max_profits.append(max_profit_o)
-                    if max_profits:
-                        max_profit = round(sum(max_profits) / len(max_profits), 2)
-
-                row_data.append(
-                    (
-                        ftuic.name,
-                        t["trade_id"],
-                        pairstr,
-                        t["open_rate"],
-                        t["current_rate"],
-                        stop_profit,
-                        max_profit,
-                        t["profit_pct"],
-                        rpfta,
-                        ctime - otime,
-                        t_dir,
-                        t["enter_tag"],
-                        t["open_date"],
-                        t["stake_amount"],
-                        t["leverage"],
-                        num_orders,
-                    )
-                )
-
-        df = pd.DataFrame(
-            row_data,
-            columns=[
-                "Bot",
-                "ID",
-                "Pair",
-                "Open Rate",
-                "Current Rate",
-                "Stop %",
-                "Max %",
-                "Profit %",
-                "Profit",
-                "Dur.",
-                "S/L",
-                "Entry",
-                "Open Date",
-                "Stake Amount",
-                "Leverage",
-                "# Orders",
-            ],
-        )
-
-        df = df.sort_values(by="ID", ascending=False)
-
-        return df
-
-    def _get_closed_trade_dataframe(self, ftuic):
-        row_data = []
-
-        trades = ftuic.get_all_closed_trades()
-        if trades is not None:
-            for t in trades:
-                otime = datetime.strptime(t["open_date"], self.DFMT)
-                ctime = datetime.strptime(t["close_date"], self.DFMT)
-
-                pairstr = t["pair"]
-                rpfta = round(float(t["profit_abs"]), 2)
-
-                row_data.append(
-                    (
-                        ftuic.name,
-                        t["trade_id"],
-                        pairstr,
-                        t["profit_pct"],
-                        rpfta,
-                        otime,
-                        ctime,
-                        ctime - otime,
-                        t["enter_tag"],
-                        t["exit_reason"],
-                        t["open_rate"],
-                        t["close_rate"],
-                        t["stake_amount"],
-                        t["leverage"],
-                    )
-                )
-
-        df = pd.DataFrame(
-            row_data,
-            columns=[
-                "Bot",
-                "ID",
-                "Pair",
-                "Profit %",
-                "Profit",
-                "Open Date",
-                "Close Date",
-                "Dur.",
-                "Entry",
-                "Exit",
-                "Open Rate",
-                "Close Rate",
-                "Stake Amount",
-                "Leverage",
-            ],
-        )
+        if self.alerts is not None:
+            self.set_interval(1, self.show_alerts)
+            # alerts watch every bot for the app's lifetime, not just the data on screen
+            if self.alerts.data_types:
+                self.subscribe_data(self.alerts, "alerts", self.alerts.data_types)
 
-        return df
-
-    def _get_enter_tag_dataframe(self, ftuic):
-        row_data = []
-
-        # get dict of bot to trades
-        trades_by_tag = {}
-
-        for at in ftuic.get_all_closed_trades():
-            if at["enter_tag"] not in trades_by_tag:
-                trades_by_tag[at["enter_tag"]] = []
-
-            trades_by_tag[at["enter_tag"]].append(at)
-
-        for tag, trades in trades_by_tag.items():
-            t_profit = 0.0
-
-            tot_trade_dur = 0
-            avg_win_trade_dur = 0
-            avg_loss_trade_dur = 0
-            win_trade_dur = 0
-            num_win = 0
-            loss_trade_dur = 0
-            num_loss = 0
-
-            for t in trades:
-                profit = float(t["profit_abs"])
-                t_profit += profit
-                tdur = (
-                    datetime.strptime(t["close_date"], self.DFMT)
-                    - datetime.strptime(t["open_date"], self.DFMT)
-                ).total_seconds()
-                tot_trade_dur = tot_trade_dur + tdur
-
-                if profit > 0:
-                    win_trade_dur = win_trade_dur + tdur
-                    num_win = num_win + 1
-                else:
-                    loss_trade_dur = loss_trade_dur + tdur
-                    num_loss = num_loss + 1
-
-            t_profit = round(t_profit, 2)
-
-            avg_trade_dur = str(timedelta(seconds=round(tot_trade_dur / len(trades), 0)))
-
-            if num_win > 0:
-                avg_win_trade_dur = str(timedelta(seconds=round(win_trade_dur / num_win, 0)))
-            if num_loss > 0:
-                avg_loss_trade_dur = str(timedelta(seconds=round(loss_trade_dur / num_loss, 0)))
-
-            row_data.append(
-                (
-                    tag,
-                    num_win,
-                    num_loss,
-                    avg_trade_dur,
-                    avg_win_trade_dur,
-                    avg_loss_trade_dur,
-                    t_profit,
-                )
-            )
-
-        df = pd.DataFrame(
-            row_data,
-            columns=[
-                "Tag",
-                "# Win",
-                "# Loss",
-                "Avg Dur.",
-                "Avg Win Dur.",
-                "Avg Loss Dur.",
-                "Profit",
-            ],
-        )
+        # a frontend of the FTUI daemon leaves the bots' streams to it
+        if isinstance(self.engine, RemoteEngine):
+            return
 
-        return df
+        for cl in self.client_dict.values():
+            if cl.start_stream():
+                cl.add_stream_listener(self.on_stream_message)
 
-    def _get_performance_dataframe(self, ftuic):
-        row_data = []
-
-        data = ftuic.get_performance()
-        if data is not None:
-            for t in data:
-                pairstr = t["pair"]
-                rpfta = round(float(t["profit_abs"]), 2)
-
-                row_data.append(
-                    (
-                        pairstr,
-                        t["count"],
-                        t["profit_pct"],
-                        rpfta,
-                    )
-                )
+    async def update_per_five_sec(self):
+        self.update_all_dfs()
 
-        df = pd.DataFrame(row_data, columns=["Pair", "# Trades", "Avg Profit %", "Total Profit"])
+    def on_stream_message(self, cl, msg_type):
+        # called from the client's stream thread; candle updates are picked up by the chart
+        if msg_type != "new_candle" and cl.name not in self.clients_disabled:
+            self.call_from_thread(self.refresh_client_dfs, cl.name)
+
+    def update_client_dfs(self, name, cl, data_types=None):
+        """Fetch the data types of one bot, by default those with live subscribers"""
+        if data_types is None:
+            data_types = self.data_subscriptions.wanted(name)
+        if not data_types:
+            return
+
+        if self.engine is not None:
+            self.engine.request({name: data_types})
+            return
+
+        # the poll, a stream update and a view's demand may all refresh one bot at once
+        with self.client_locks[name]:
+            # serve the last good data while the circuit breaker holds this bot back
+            if not cl.is_available():
+                self.mark_stale(name)
+                return
 
-        return df
+            try:
+                data = {data_type: FRAME_BUILDERS[data_type](cl) for data_type in data_types}
+            except Exception as e:
+                logger.warning(f"Failed to update data for {name}: {e}")
+                self.mark_stale(name)
+                return
+
+            self.apply_client_data(name, data, cl.is_stale)
+
+    def apply_client_data(self, name, data, stale):
+        """Store freshly built frames of one bot and update the fleet views"""
+        if name not in self.client_dfs:
+            self.client_dfs[name] = {"fetched": {}}
+
+        now = monotonic()
+        for data_type in data:
+            self.client_dfs[name]["fetched"][data_type] = now
+
+        self.client_dfs[name].update(data)
+        self.client_dfs[name]["stale"] = stale
+
+        if "op_data" in data:
+            if stale:
+                self.open_profit_history.drop(name)
+            else:
+                self.open_profit_history.update(name, time(), data["op_data"]["Profit"].sum())
+        if "cl_data" in data:
+            self.fleet_profit.update(name, data["cl_data"])
+            self.fleet_equity.update(name, data["cl_data"])
+            self.fleet_index.update(name, data["cl_data"])
+        if "perf_data" in data:
+            self.fleet_pairs.update(name, data["perf_data"])
+
+        if self.alerts is not None:
+            self.alerts.on_refresh(name, data, stale)
+
+    def mark_stale(self, name):
+        if name not in self.client_dfs:
+            self.client_dfs[name] = {"fetched": {}}
+        self.client_dfs[name]["stale"] = True
+        self.open_profit_history.drop(name)
+
+        if self.alerts is not None:
+            self.alerts.on_refresh(name, {}, True)
+
+    def show_alerts(self):
+        for rule, bot, message in self.alerts.pop_alerts():
+            self.notify(message, title=f"Alert: {rule.name}", severity="warning", timeout=30)
+
+    def start_engine(self, connect=None):
+        """
+        Move polling and dataframe building into a separate process, or to
+        the FTUI daemon listening on connect
+        """
+        callbacks = {
+            "on_snapshot": lambda name, data_type, frame, stale: self.apply_client_data(
+                name, {data_type: frame}, stale
+            ),
+            "on_failed": lambda name, data_types: self.mark_stale(name),
+        }
+        if connect:
+            self.engine = RemoteEngine(connect, **callbacks)
+        else:
+            self.engine = DataEngine(self.client_dict, **callbacks)
+        self.engine.start()
+
+    def _enabled_clients(self, bots=None) -> dict:
+        if bots is None:
+            bots = self.client_dict.keys()
+        return {
+            name: self.client_dict[name]
+            for name in bots
+            if name in self.client_dict and name not in self.clients_disabled
+        }
 
     @work(group="df_updater_worker", exclusive=False, thread=True)
     def update_all_dfs(self):
-        all_closed_df = pd.DataFrame()
-
-        for name, cl in self.client_dict.items():
-            if name not in self.clients_disabled:
-                op_data = self._get_open_trade_dataframe(cl)
-                cl_data = self._get_closed_trade_dataframe(cl)
-                tag_data = self._get_enter_tag_dataframe(cl)
-                perf_data = self._get_performance_dataframe(cl)
-
-                if cl.name not in self.client_dfs:
-                    self.client_dfs[name] = {}
-
-                self.client_dfs[name]["op_data"] = op_data
-                self.client_dfs[name]["cl_data"] = cl_data
-                self.client_dfs[name]["tag_data"] = tag_data
-                self.client_dfs[name]["perf_data"] = perf_data
-
-                if cl_data is not None and not cl_data.empty:
-                    all_closed_df = pd.concat([all_closed_df, cl_data])
-
-        self.client_dfs["all_closed"] = all_closed_df
+        # don't let refreshes pile up behind a slow bot
+        if not self.update_lock.acquire(blocking=False):
+            return
+
+        try:
+            clients = {
+                name: cl
+                for name, cl in self._enabled_clients().items()
+                if self.data_subscriptions.wanted(name)
+            }
+
+            if clients:
+                with ThreadPoolExecutor(max_workers=min(len(clients), 16)) as executor:
+                    for name, cl in clients.items():
+                        executor.submit(self.update_client_dfs, name, cl)
+
+            self.last_update = datetime.now(tz=timezone.utc)
+        finally:
+            self.update_lock.release()
+
+    @work(group="df_stream_worker", exclusive=False, thread=True)
+    def refresh_client_dfs(self, name):
+        self.update_client_dfs(name, self.client_dict[name])
+
+    def subscribe_data(self, owner, key, data_types, bots=None, on_refresh=None):
+        """
+        Keep data_types of bots (default all) fetched while the subscription lives.
+
+        Data not fetched in the last DATA_FRESH_FOR seconds is pulled at once,
+        and on_refresh is then called on the main thread so the view can redraw.
+        """
+        self.data_subscriptions.subscribe(owner, key, data_types, bots=bots)
+        self.fetch_data(tuple(data_types), bots, on_refresh)
+
+    def unsubscribe_data(self, owner, key=None):
+        self.data_subscriptions.unsubscribe(owner, key)
+
+    @work(group="df_demand_worker", exclusive=False, thread=True)
+    def fetch_data(self, data_types, bots=None, on_refresh=None):
+        now = monotonic()
+
+        due = {}
+        for name, cl in self._enabled_clients(bots).items():
+            fetched = self.client_dfs.get(name, {}).get("fetched", {})
+            missing = [
+                d for d in data_types
+                if d not in fetched or now - fetched[d] >= self.DATA_FRESH_FOR
+            ]
+            if missing:
+                due[name] = (cl, missing)
+
+        if not due:
+            return
+
+        if self.engine is not None:
+            # the engine answers on its listener thread once the snapshots are in
+            callback = None
+            if on_refresh is not None:
+                callback = partial(self.call_from_thread, on_refresh)
+            wanted = {name: missing for name, (_, missing) in due.items()}
+            self.engine.request(wanted, callback)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(len(due), 16)) as executor:
+            for name, (cl, missing) in due.items():
+                executor.submit(self.update_client_dfs, name, cl, missing)
+
+        if on_refresh is not None:
+            self.call_from_thread(on_refresh)
+
+    def fleet_view(self, data_type, bots=None) -> FleetTradeView:
+        """View over one data type of all enabled bots, without copying their frames"""
+        if bots is None:
+            bots = self.client_dict.keys()
+        bots = [b for b in bots if b not in self.clients_disabled]
+        return FleetTradeView(self.client_dfs, data_type, bots=bots)
 
     def watch_show_clients(self, show_clients: bool) -> None:
         self.set_class(show_clients, "-show-clients")
@@ -405,7 +358,7 @@ class FreqText(App):
         await self.switch_mode(mode)
 
 
-def setup(args):
+def setup(args, recorder=None, replay=None, lazy=False):
     config = args.config
     client_dict = {}
 
@@ -413,11 +366,19 @@ def setup(args):
 
     pool_connections = 20
     if args.pool_connections:
-        pool_connections = args.pool_connections
+        pool_connections = int(args.pool_connections)
 
     pool_maxsize = 10
     if args.pool_maxsize:
-        pool_maxsize = args.pool_maxsize
+        pool_maxsize = int(args.pool_maxsize)
+
+    connect_timeout = 3
+    if args.connect_timeout:
+        connect_timeout = float(args.connect_timeout)
+
+    read_timeout = 10
+    if args.read_timeout:
+        read_timeout = float(args.read_timeout)
 
     if args.yaml:
         for s in args.servers:
@@ -431,6 +392,13 @@ def setup(args):
                     config_path=config,
                     pool_connections=pool_connections,
                     pool_maxsize=pool_maxsize,
+                    connect_timeout=connect_timeout,
+                    read_timeout=read_timeout,
+                    ws_token=s.get("ws_token"),
+                    chart_indicators=s.get("indicators", args.indicators),
+                    recorder=recorder,
+                    replay=replay,
+                    lazy=lazy,
                 )
 
                 client_dict[ftui_client.name] = ftui_client
@@ -443,6 +411,12 @@ def setup(args):
                     config_path=config,
                     pool_connections=pool_connections,
                     pool_maxsize=pool_maxsize,
+                    connect_timeout=connect_timeout,
+                    read_timeout=read_timeout,
+                    chart_indicators=args.indicators,
+                    recorder=recorder,
+                    replay=replay,
+                    lazy=lazy,
                 )
                 client_dict[ftui_client.name] = ftui_client
             except Exception as e:
@@ -465,6 +439,42 @@ def main():
     parser.add_argument("-c", "--config", nargs="?", help="Config to parse")
     parser.add_argument("--pool_connections", nargs="?", default=20, help="Number of pool connections")
     parser.add_argument("--pool_maxsize", nargs="?", default=10, help="Pool cache maxsize")
+    parser.add_argument(
+        "--connect_timeout", nargs="?", default=3, help="Seconds to wait when connecting to a bot"
+    )
+    parser.add_argument(
+        "--read_timeout", nargs="?", default=10, help="Seconds to wait for a bot to respond"
+    )
+    parser.add_argument(
+        "--indicators", nargs="*", help="Strategy indicator columns to overlay on the bot chart"
+    )
+
+    parser.add_argument(
+        "--engine",
+        action="store_true",
+        help="Poll the bots and build the trade data in a separate process",
+    )
+    parser.add_argument(
+        "--daemon",
+        metavar="ADDRESS",
+        help="Run as a daemon polling the bots for FTUI frontends, on a Unix socket path or host:port",
+    )
+    parser.add_argument(
+        "--connect",
+        metavar="ADDRESS",
+        help="Get the trade data from the FTUI daemon at ADDRESS instead of polling the bots",
+    )
+
+    parser.add_argument("--record", metavar="FILE", help="Record every bot response to FILE")
+    parser.add_argument(
+        "--replay", metavar="FILE", help="Replay the bot responses recorded in FILE"
+    )
+    parser.add_argument(
+        "--replay_speed",
+        nargs="?",
+        default=1,
+        help="Replay speed: 1 is real time, 0 serves the responses in order as fast as asked",
+    )
 
     parser.add_argument(
         "-y", "--yaml", nargs="?", help="Supply a YAML file instead of command line arguments."
@@ -478,10 +488,42 @@ def main():
         import yaml
 
         with open(args.yaml, "r") as yamlfile:
-            args = fth.dotdict(yaml.safe_load(yamlfile))
-            args.yaml = True
-
-    client_dict = setup(args)
+            yaml_args = yaml.safe_load(yamlfile)
+
+        # options given on the command line take precedence over the YAML file
+        cli_args = {
+            k: v for k, v in vars(args).items() if k != "yaml" and v != parser.get_default(k)
+        }
+        args = fth.dotdict({**yaml_args, **cli_args})
+        args.yaml = True
+
+    if (args.record or args.replay) and (args.engine or args.connect):
+        raise RuntimeError("--record and --replay need the bots polled in the FTUI process")
+
+    recorder = SessionRecorder(args.record) if args.record else None
+    replay = None
+    if args.replay:
+        replay_speed = 1 if args.replay_speed is None else float(args.replay_speed)
+        replay = SessionReplay(args.replay, speed=replay_speed)
+
+    try:
+        run(args, recorder, replay)
+    finally:
+        if recorder is not None:
+            recorder.close()
+            print(f"Recorded {recorder.count} responses to {recorder.path}")
+
+
+def run(args, recorder=None, replay=None):
+    # the clients of a daemon frontend only serve the views' on demand calls
+    client_dict = setup(args, recorder, replay, lazy=bool(args.connect))
+
+    if args.daemon:
+        try:
+            AggregatorDaemon(client_dict).serve(args.daemon)
+        except KeyboardInterrupt:
+            pass
+        return
 
     ftapp = FreqText()
     ftapp.set_client_dict(client_dict)
@@ -490,32 +532,33 @@ def main():
     if args.debug:
         ftapp.debug_mode = True
 
-    print("\nStarting FTUI - preloading all dataframes...", end="")
-
-    all_closed_df = pd.DataFrame()
+    print("\nStarting FTUI - preloading dashboard data...", end="")
 
-    for name, cl in client_dict.items():
-        print("", end=".", flush=True)
+    if args.connect:
+        ftapp.start_engine(connect=args.connect)
 
-        op_data = ftapp._get_open_trade_dataframe(cl)
-        cl_data = ftapp._get_closed_trade_dataframe(cl)
-        tag_data = ftapp._get_enter_tag_dataframe(cl)
-        perf_data = ftapp._get_performance_dataframe(cl)
+        client_dict = adopt_daemon_bots(client_dict, ftapp.engine.bots())
+        ftapp.set_client_dict(client_dict)
 
-        if cl.name not in ftapp.client_dfs:
-            ftapp.client_dfs[name] = {}
-
-        ftapp.client_dfs[name]["op_data"] = op_data
-        ftapp.client_dfs[name]["cl_data"] = cl_data
-        ftapp.client_dfs[name]["tag_data"] = tag_data
-        ftapp.client_dfs[name]["perf_data"] = perf_data
+        preloaded = threading.Event()
+        ftapp.engine.request(
+            {name: DashboardScreen.DATA_TYPES for name in client_dict}, callback=preloaded.set
+        )
+        preloaded.wait(timeout=30)
+    else:
+        for name, cl in client_dict.items():
+            print("", end=".", flush=True)
 
-        if cl_data is not None and not cl_data.empty:
-            all_closed_df = pd.concat([all_closed_df, cl_data])
+            ftapp.update_client_dfs(name, cl, DashboardScreen.DATA_TYPES)
 
-    ftapp.client_dfs["all_closed"] = all_closed_df
+        if args.engine:
+            ftapp.start_engine()
 
-    ftapp.run()
+    try:
+        ftapp.run()
+    finally:
+        if ftapp.engine is not None:
+            ftapp.engine.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,311 @@
+"""
+Alert rules evaluated against each data refresh.
+
+Rules are configured in the YAML config under `alerts`. A refresh of one
+bot only runs the rules watching the data that refresh brought in, and
+each rule only looks at that bot's new data, keeping whatever it needs
+about the rest of the fleet as running state. An alert fires when its
+condition starts to hold, and can fire again once it has cleared.
+"""
+
+import logging
+import os
+import shlex
+import subprocess
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from time import monotonic, perf_counter
+
+import pandas as pd
+
+from ftui.ftui_series import EquityCurve
+
+logger = logging.getLogger("ftui_alerts")
+
+
+def _update_closed_curve(curves, bot, cl_data) -> EquityCurve:
+    """
+    Bring a bot's closed trade EquityCurve in curves up to date with cl_data.
+
+    Only trades the curve has not seen are added, so rules need not go over
+    the bot's whole trade history on every refresh.
+    """
+    if bot not in curves or cl_data.empty:
+        curves[bot] = EquityCurve()
+    curves[bot].update(cl_data)
+    return curves[bot]
+
+
+class AlertRule:
+    """
+    Base class of the alert rules.
+
+    `data_types` are the refreshed data the rule is evaluated on, "stale"
+    standing for the reachability of the bot. evaluate() returns the
+    conditions that hold for the refreshed bot as {key: message}; fleet-wide
+    rules set `fleet` and return the conditions of the whole fleet.
+    """
+
+    type = None
+    data_types = ()
+    fleet = False
+
+    def __init__(self, name=None, bots=None):
+        self.name = name or self.type
+        self.bots = None if bots is None else set(bots)
+
+    def covers(self, bot) -> bool:
+        return self.bots is None or bot in self.bots
+
+    def evaluate(self, bot, data, stale, now) -> dict:
+        raise NotImplementedError
+
+
+class UnreachableRule(AlertRule):
+    """A bot has not answered for `after` seconds"""
+
+    type = "unreachable"
+    data_types = ("stale",)
+
+    def __init__(self, after=0, **kwargs):
+        super().__init__(**kwargs)
+        self.after = float(after)
+        self.stale_since = {}
+
+    def evaluate(self, bot, data, stale, now) -> dict:
+        if not stale:
+            self.stale_since.pop(bot, None)
+            return {}
+
+        since = self.stale_since.setdefault(bot, now)
+        if now - since < self.after:
+            return {}
+        return {bot: f"{bot} is unreachable"}
+
+
+class OpenTradeLossRule(AlertRule):
+    """An open trade's profit is below `below` percent"""
+
+    type = "open_trade_loss"
+    data_types = ("op_data",)
+
+    def __init__(self, below, **kwargs):
+        super().__init__(**kwargs)
+        self.below = float(below)
+
+    def evaluate(self, bot, data, stale, now) -> dict:
+        op_data = data["op_data"]
+        if op_data.empty:
+            return {}
+
+        losing = op_data.loc[op_data["Profit %"].to_numpy(dtype=float) < self.below]
+        return {
+            (bot, trade_id): f"{bot} trade {trade_id} {pair} is at {pct}%"
+            for trade_id, pair, pct in zip(losing["ID"], losing["Pair"], losing["Profit %"])
+        }
+
+
+class FleetDrawdownRule(AlertRule):
+    """
+    Fleet profit (closed plus open) is more than `above` below its peak.
+
+    Profit is in stake currency, summed over the bots the rule covers.
+    """
+
+    type = "fleet_drawdown"
+    data_types = ("op_data", "cl_data")
+    fleet = True
+
+    def __init__(self, above, **kwargs):
+        super().__init__(**kwargs)
+        self.above = float(above)
+        self.curves = {}
+        self.closed = {}
+        self.open = {}
+        self.peak = None
+
+    def evaluate(self, bot, data, stale, now) -> dict:
+        if "cl_data" in data:
+            curve = _update_closed_curve(self.curves, bot, data["cl_data"])
+            self.closed[bot] = float(curve.equity[-1]) if len(curve.equity) else 0.0
+        if "op_data" in data:
+            self.open[bot] = float(data["op_data"]["Profit"].sum())
+
+        total = sum(self.closed.values()) + sum(self.open.values())
+        self.peak = total if self.peak is None else max(self.peak, total)
+
+        drawdown = self.peak - total
+        if drawdown <= self.above:
+            return {}
+        return {"fleet": f"Fleet profit is {drawdown:.2f} below its peak of {self.peak:.2f}"}
+
+
+class NoTradesRule(AlertRule):
+    """A bot has neither opened nor closed a trade for `hours` hours"""
+
+    type = "no_trades"
+    data_types = ("op_data", "cl_data")
+
+    def __init__(self, hours, **kwargs):
+        super().__init__(**kwargs)
+        self.period = pd.Timedelta(hours=float(hours))
+        self.curves = {}
+        self.last_trade = {}
+
+    def evaluate(self, bot, data, stale, now) -> dict:
+        latest = [self.last_trade.get(bot)]
+        if "op_data" in data and not data["op_data"].empty:
+            latest.append(pd.to_datetime(data["op_data"]["Open Date"]).max())
+        if "cl_data" in data:
+            # the curve is in close date order, its last trade closed last
+            curve = _update_closed_curve(self.curves, bot, data["cl_data"])
+            if len(curve.times):
+                latest.append(pd.Timestamp(curve.times[-1]))
+
+        latest = [t for t in latest if t is not None and not pd.isna(t)]
+        if not latest:
+            return {}
+        self.last_trade[bot] = max(latest)
+
+        # trade dates are naive UTC
+        idle = pd.Timestamp(datetime.now(tz=timezone.utc).replace(tzinfo=None)) - self.last_trade[bot]
+        if idle <= self.period:
+            return {}
+        return {bot: f"{bot} has had no trades for {idle.total_seconds() / 3600:.1f} hours"}
+
+
+RULE_TYPES = {
+    r.type: r for r in (UnreachableRule, OpenTradeLossRule, FleetDrawdownRule, NoTradesRule)
+}
+
+
+class AlertEngine:
+    """
+    Runs the alert rules on each refresh and raises the alerts.
+
+    Fired alerts are queued for the UI, see pop_alerts(), and passed to the
+    optional command hook, which is run with the alert in the environment
+    (FTUI_ALERT_RULE, FTUI_ALERT_BOT, FTUI_ALERT_MESSAGE) and the message as
+    its last argument.
+    """
+
+    MAX_QUEUED = 100
+
+    def __init__(self, rules, command=None):
+        self.rules = rules
+        self.command = shlex.split(command) if isinstance(command, str) else command
+
+        # (rule index, bot or None for fleet rules) -> keys currently alerting
+        self.active = {}
+        self.alerts = deque(maxlen=self.MAX_QUEUED)
+        self._lock = threading.Lock()
+
+        self.evaluations = 0
+        self.eval_time = 0.0
+        self.max_eval_time = 0.0
+        self.fired = 0
+
+    @property
+    def data_types(self) -> tuple:
+        """
+        Data the rules need kept fetched for every bot, whatever is on screen.
+        A bot's reachability shows in any fetch, the open trades are the cheapest.
+        """
+        wanted = set()
+        for rule in self.rules:
+            wanted.update("op_data" if d == "stale" else d for d in rule.data_types)
+        return tuple(sorted(wanted))
+
+    @classmethod
+    def from_config(cls, config) -> "AlertEngine":
+        rules = []
+        for rule in config.get("rules") or []:
+            params = dict(rule)
+            rule_type = params.pop("type", None)
+            if rule_type not in RULE_TYPES:
+                raise ValueError(
+                    f"Unknown alert rule type {rule_type}, use one of: {', '.join(RULE_TYPES)}"
+                )
+            try:
+                rules.append(RULE_TYPES[rule_type](**params))
+            except TypeError as e:
+                raise ValueError(f"Invalid {rule_type} alert rule: {e}") from e
+
+        return cls(rules, command=config.get("command"))
+
+    def on_refresh(self, bot, data, stale):
+        """Evaluate the rules watching the data types in data, or staleness"""
+        changed = set(data) | {"stale"}
+        now = monotonic()
+        fired = []
+
+        start = perf_counter()
+        with self._lock:
+            for i, rule in enumerate(self.rules):
+                if not rule.covers(bot) or changed.isdisjoint(rule.data_types):
+                    continue
+
+                try:
+                    triggered = rule.evaluate(bot, data, stale, now)
+                except Exception as e:
+                    logger.warning(f"Alert rule {rule.name} failed for {bot}: {e}")
+                    continue
+
+                scope = (i, None if rule.fleet else bot)
+                previous = self.active.get(scope, set())
+                fired += [(rule, bot, triggered[k]) for k in triggered.keys() - previous]
+                self.active[scope] = set(triggered)
+
+            elapsed = perf_counter() - start
+            self.evaluations += 1
+            self.eval_time += elapsed
+            self.max_eval_time = max(self.max_eval_time, elapsed)
+            self.fired += len(fired)
+            self.alerts.extend(fired)
+
+        for alert in fired:
+            self.run_command(*alert)
+
+    def pop_alerts(self) -> list:
+        with self._lock:
+            alerts = list(self.alerts)
+            self.alerts.clear()
+        return alerts
+
+    def run_command(self, rule, bot, message):
+        if not self.command:
+            return
+
+        env = {
+            "FTUI_ALERT_RULE": rule.name,
+            "FTUI_ALERT_BOT": "" if rule.fleet else bot,
+            "FTUI_ALERT_MESSAGE": message,
+        }
+
+        def run():
+            try:
+                subprocess.run(
+                    [*self.command, message],
+                    env={**os.environ, **env},
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=30,
+                    check=False,
+                )
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning(f"Alert command failed: {e}")
+
+        threading.Thread(target=run, name="ftui-alert-command", daemon=True).start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rules": len(self.rules),
+                "evaluations": self.evaluations,
+                "mean_time": self.eval_time / self.evaluations if self.evaluations else 0.0,
+                "max_time": self.max_eval_time,
+                "fired": self.fired,
+                "active": sum(len(keys) for keys in self.active.values()),
+            }
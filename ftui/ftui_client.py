@@ -3,13 +3,22 @@
 
 import logging
 import sys
-from time import sleep
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from itertools import islice
+from time import monotonic, sleep
 from typing import Optional
+from urllib.parse import urlencode
 
 import freqtrade_client.ft_rest_client as ftrc
 import numpy as np
 import pandas as pd
+import rapidjson
 from freqtrade_client.ft_client import load_config
+from requests.exceptions import HTTPError, RequestException
+
+from ftui.ftui_stream import FTUIStream
 
 logging.basicConfig(
     level=logging.WARNING,
@@ -18,7 +27,285 @@ logging.basicConfig(
 logger = logging.getLogger("ftui_client")
 
 
+class CircuitBreaker:
+    """
+    Per-bot circuit breaker.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    requests are refused until the backoff has elapsed. A single probe is
+    then let through; success closes the breaker, failure doubles the
+    backoff up to `max_backoff` seconds.
+    """
+
+    def __init__(self, failure_threshold=3, base_backoff=5, max_backoff=300):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.failures = 0
+        self.backoff = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def ready(self) -> bool:
+        """Whether a request would currently be allowed, without claiming the probe"""
+        with self._lock:
+            return self.opened_at is None or monotonic() - self.opened_at >= self.backoff
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+
+            if monotonic() - self.opened_at >= self.backoff:
+                # half-open: let one probe through and hold the rest back
+                self.opened_at = monotonic()
+                return True
+
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.backoff = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    self.backoff = self.base_backoff
+                else:
+                    self.backoff = min(self.backoff * 2, self.max_backoff)
+                self.opened_at = monotonic()
+
+
+class FTUIRestClient(ftrc.FtRestClient):
+    """
+    FtRestClient guarded by a CircuitBreaker.
+
+    The last good response of the small, frequently polled endpoints is kept
+    so that callers are served stale data rather than None while a bot is
+    unreachable.
+    """
+
+    STALE_CACHE_PATHS = {
+        "balance",
+        "count",
+        "daily",
+        "monthly",
+        "performance",
+        "profit",
+        "show_config",
+        "status",
+        "sysinfo",
+        "version",
+        "weekly",
+        "whitelist",
+    }
+
+    # large responses, decoded with rapidjson rather than json
+    FAST_DECODE_PATHS = {"pair_candles", "status", "trades"}
+    # closed trade history fields FTUI never reads; trade details come from /trade/{id}
+    TRADE_HISTORY_DROP_FIELDS = ("orders",)
+
+    def __init__(
+        self,
+        serverurl,
+        username=None,
+        password=None,
+        *,
+        breaker=None,
+        recorder=None,
+        replay=None,
+        **kwargs,
+    ):
+        super().__init__(serverurl, username, password, **kwargs)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.last_good = {}
+        self.last_status = None
+
+        # ftui_session.SessionRecorder / SessionReplay
+        self.recorder = recorder
+        self.replay = replay
+
+    def _call(self, method, apipath, params=None, data=None, files=None):
+        key = (apipath, urlencode(params) if params else "")
+        cacheable = str(method).upper() == "GET" and apipath in self.STALE_CACHE_PATHS
+
+        if not self.breaker.allow_request():
+            return self.last_good.get(key)
+
+        rejected = False
+        try:
+            if self.replay is not None:
+                try:
+                    resp = self.replay.response(self._serverurl, method, apipath, params)
+                except KeyError:
+                    # not made while recording, which says nothing about the bot
+                    return self.last_good.get(key)
+            elif apipath in self.FAST_DECODE_PATHS:
+                resp = self._fast_call(method, apipath, params=params, data=data)
+            else:
+                resp = self._request(method, apipath, params=params, data=data).json()
+        except HTTPError as e:
+            if self._is_bot_failure(e.response.status_code):
+                logger.warning(f"Request to {self._serverurl}/{apipath} failed: {e}")
+                resp = None
+            else:
+                # the bot answered and only refused this request, e.g. an unknown trade id
+                rejected = True
+                try:
+                    resp = e.response.json()
+                except ValueError:
+                    resp = None
+        except (RequestException, ValueError) as e:
+            logger.warning(f"Request to {self._serverurl}/{apipath} failed: {e}")
+            resp = None
+
+        if self.recorder is not None:
+            self.recorder.record(self._serverurl, method, apipath, params, resp)
+
+        if rejected:
+            return resp
+
+        if resp is None:
+            self.breaker.record_failure()
+            return self.last_good.get(key)
+
+        self.breaker.record_success()
+        if cacheable:
+            self.last_good[key] = resp
+
+        return resp
+
+    @staticmethod
+    def _is_bot_failure(status) -> bool:
+        """Whether an error status means the bot is down or unusable, not just this request"""
+        return status >= 500 or status == 401
+
+    def _request(self, method, apipath, params=None, data=None):
+        """
+        Same request as FtRestClient._call, but a non-2xx response (e.g. a 401
+        for bad credentials) raises HTTPError instead of passing as a result.
+        """
+        url = f"{self._serverurl}/api/v1/{apipath}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+
+        hd = {"Accept": "application/json", "Content-Type": "application/json"}
+        resp = self._session.request(
+            method, url, headers=hd, timeout=self._timeout, data=rapidjson.dumps(data)
+        )
+        self.last_status = resp.status_code
+        if not resp.ok:
+            resp.close()
+            raise HTTPError(f"{resp.status_code} {resp.reason}", response=resp)
+        return resp
+
+    def _fast_call(self, method, apipath, params=None, data=None):
+        """
+        Same as _request, but the body is decoded by rapidjson instead of json.
+        """
+        resp = self._request(method, apipath, params=params, data=data)
+        result = rapidjson.loads(resp.content, number_mode=rapidjson.NM_NATIVE | rapidjson.NM_NAN)
+
+        # the closed trade history is kept for the whole session, so keep it lean
+        if apipath == "trades" and isinstance(result, dict):
+            for t in result.get("trades") or []:
+                for field in self.TRADE_HISTORY_DROP_FIELDS:
+                    t.pop(field, None)
+
+        return result
+
+
+# candle columns always kept in the chart cache, indicators are added on request
+CANDLE_COLUMNS = ["date", "Open", "Close", "High", "Low"]
+
+API_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def deep_size(obj, seen=None) -> int:
+    """Approximate bytes held by obj and everything it references, counting shared objects once"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_size(getattr(obj, s), seen) for s in obj.__slots__)
+    return size
+
+
+class ClosedTrade:
+    """
+    The fields of a closed /trades entry that FTUI reads.
+
+    Dates are parsed once, repeated strings (pairs, tags, exit reasons) are
+    interned, and everything else in the API dict is dropped. The full trade,
+    orders included, is loaded on demand with FTUIClient.get_trade_info.
+    """
+
+    __slots__ = (
+        "close_date",
+        "close_rate",
+        "enter_tag",
+        "exit_reason",
+        "is_short",
+        "leverage",
+        "open_date",
+        "open_rate",
+        "pair",
+        "profit_abs",
+        "profit_pct",
+        "stake_amount",
+        "trade_id",
+    )
+
+    def __init__(self, t: dict):
+        self.trade_id = int(t["trade_id"])
+        self.pair = sys.intern(t["pair"])
+        self.is_short = bool(t.get("is_short"))
+        self.open_date = datetime.strptime(t["open_date"], API_DATE_FORMAT)
+        self.close_date = datetime.strptime(t["close_date"], API_DATE_FORMAT)
+        self.open_rate = t["open_rate"]
+        self.close_rate = t["close_rate"]
+        self.stake_amount = t["stake_amount"]
+        self.leverage = t.get("leverage", 1.0)
+        self.profit_pct = t["profit_pct"]
+        self.profit_abs = t["profit_abs"]
+        self.enter_tag = sys.intern(t["enter_tag"]) if t.get("enter_tag") else t.get("enter_tag")
+        self.exit_reason = (
+            sys.intern(t["exit_reason"]) if t.get("exit_reason") else t.get("exit_reason")
+        )
+
+    def __repr__(self):
+        return f"ClosedTrade({self.trade_id}, {self.pair}, {self.profit_pct}%)"
+
+
 class FTUIClient:
+    # while streaming, still re-check the closed trade count at this interval (seconds)
+    STREAM_SAFETY_REFRESH = 60
+    # closed trades are fetched for paging in blocks of this many, oldest first
+    CLOSED_TRADE_BLOCK = 50
+    MAX_CACHED_BLOCKS = 40
+    # balances change slowly, /balance is only called this often (seconds)
+    BALANCE_REFRESH = 300
+    # records measured for the memory report, which scales their mean size up by the count
+    RAW_SIZE_SAMPLE = 20
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -30,7 +317,18 @@ class FTUIClient:
         config_path=None,
         pool_connections=20,
         pool_maxsize=10,
+        connect_timeout=3,
+        read_timeout=10,
+        ws_token=None,
+        chart_indicators=None,
+        recorder=None,
+        replay=None,
+        lazy=False,
     ):
+        # the arguments this client was built with, to build it again in another
+        # process (see ftui_engine); the session recorder and replay stay here
+        self.spec = {k: v for k, v in locals().items() if k not in ("self", "recorder", "replay")}
+
         self.name = name
         self.url = url
         self.port = port
@@ -41,9 +339,40 @@ class FTUIClient:
         self.config = None
         self.pool_connections = pool_connections
         self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.breaker = CircuitBreaker()
+        self.recorder = recorder
+        self.replay = replay
+
+        self.chart_indicators = list(chart_indicators or [])
+
+        self.ws_token = ws_token
+        self.stream = None
+        self.stream_listeners = []
+        self.candle_versions = {}
+
+        # trade details by trade id; closed trades never change so are kept for good
+        self.trade_info = {}
 
         self.prev_closed_trade_count = 0
         self.all_closed_trades = []
+        # bytes per closed trade as an API dict and compacted, sampled when pages are fetched
+        self.raw_trade_bytes = None
+        self.compact_trade_bytes = None
+        self.closed_trades_dirty = True
+        self.last_closed_trades_check = 0
+
+        self.balance = None
+        self.last_balance_check = 0
+
+        self.closed_trade_count = None
+        self.closed_trade_blocks = OrderedDict()
+        self.closed_trade_blocks_lock = threading.Lock()
+
+        # a lazy client makes no request until it is used, e.g. the views' on demand
+        # calls of a frontend getting its data from the FTUI daemon
+        self.lazy = lazy
 
         self.setup_client()
 
@@ -56,6 +385,9 @@ class FTUIClient:
             if self.username is None and self.password is None:
                 self.username = config.get("api_server", {}).get("username")
                 self.password = config.get("api_server", {}).get("password")
+
+            if self.ws_token is None:
+                self.ws_token = config.get("api_server", {}).get("ws_token")
         else:
             if self.config_path is not None:
                 config = load_config(self.config_path)
@@ -64,25 +396,44 @@ class FTUIClient:
                     self.username = config.get("api_server", {}).get("username")
                     self.password = config.get("api_server", {}).get("password")
 
+                if self.ws_token is None:
+                    self.ws_token = config.get("api_server", {}).get("ws_token")
+
+        # freqtrade accepts a list of ws tokens, any of them will do
+        if isinstance(self.ws_token, list):
+            self.ws_token = self.ws_token[0] if self.ws_token else None
+
         #if self.name is None:
         #    self.name = f"{self.url}:{self.port}"
 
         server_url = f"http://{self.url}:{self.port}"
 
-        client = ftrc.FtRestClient(server_url,
-                                   self.username,
-                                   self.password,
-                                   pool_connections=self.pool_connections,
-                                   pool_maxsize=self.pool_maxsize)
+        client = FTUIRestClient(
+            server_url,
+            self.username,
+            self.password,
+            breaker=self.breaker,
+            recorder=self.recorder,
+            replay=self.replay,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            timeout=(self.connect_timeout, self.read_timeout),
+        )
+
+        if self.lazy:
+            # the config is fetched on first use by get_client_config
+            self.rest_client = client
+            if self.name is None:
+                self.name = f"{self.url}:{self.port}"
+            return
 
         if client is not None:
             c = client.version()
-            if c is not None:
-                if "detail" in c.keys() and (c["detail"] == "Unauthorized"):
-                    raise Exception(
-                        f"Could not connect to bot [{self.url}:{self.port}]: Unauthorised"
-                    )
-            else:
+            if client.last_status == 401:
+                raise Exception(
+                    f"Could not connect to bot [{self.url}:{self.port}]: Unauthorised"
+                )
+            if c is None:
                 raise Exception(
                     (
                         f"Could not connect to bot [{self.url}:{self.port}]: "
@@ -130,13 +481,67 @@ class FTUIClient:
         # return current_config
         return self.config
 
-    def get_pair_dataframe(self, pair, limit=200) -> pd.DataFrame:
+    @property
+    def is_stale(self) -> bool:
+        """True if the last request to this bot failed and cached data is being served"""
+        return self.breaker.failures > 0
+
+    def is_available(self) -> bool:
+        """False while the circuit breaker is holding requests to this bot back"""
+        return self.breaker.ready()
+
+    def start_stream(self) -> bool:
+        """Subscribe to the bot's websocket message stream, if a ws_token is configured"""
+        # a replayed session is polled only, its stream messages are not recorded
+        if self.ws_token is None or self.replay is not None:
+            return False
+
+        if self.stream is None:
+            self.stream = FTUIStream(self.url, self.port, self.ws_token, self._on_stream_message)
+        return self.stream.start()
+
+    @property
+    def stream_connected(self) -> bool:
+        return self.stream is not None and self.stream.connected
+
+    def add_stream_listener(self, callback):
+        """Register callback(client, msg_type), called from the stream thread"""
+        self.stream_listeners.append(callback)
+
+    def _on_stream_message(self, msg):
+        msg_type = msg["type"]
+
+        if msg_type == "new_candle":
+            # data is (pair, timeframe, candle_type)
+            data = msg.get("data")
+            if data:
+                key = (data[0], data[1])
+                self.candle_versions[key] = self.candle_versions.get(key, 0) + 1
+        elif msg_type == "exit_fill":
+            self.closed_trades_dirty = True
+
+        for callback in self.stream_listeners:
+            callback(self, msg_type)
+
+    def candle_version(self, pair, timeframe=None) -> int:
+        """Number of new_candle events seen for pair, to tell if cached candles are behind"""
+        if timeframe is None:
+            timeframe = self.get_client_config()["timeframe"]
+        return self.candle_versions.get((pair, timeframe), 0)
+
+    def get_pair_dataframe(self, pair, limit=200, indicators=None) -> pd.DataFrame:
+        """
+        Analysed candles for the pair.
+
+        With `indicators`, only the candle columns and the requested indicator
+        columns the strategy provides are kept, the indicators as float32.
+        """
         cl = self.rest_client
         candles = cl.pair_candles(
             pair, timeframe=self.get_client_config()["timeframe"], limit=limit
         )
 
-        if candles is not None:
+        if candles is not None and "columns" in candles:
             cols = candles["columns"]
             data = candles["data"]
 
@@ -146,6 +551,13 @@ class FTUIClient:
                     columns={"open": "Open", "close": "Close", "high": "High", "low": "Low"},
                     inplace=True,
                 )
+
+                if indicators is not None:
+                    ind_cols = [c for c in indicators if c in df.columns and c not in CANDLE_COLUMNS]
+                    df = df[CANDLE_COLUMNS + ind_cols].copy()
+                    for col in ind_cols:
+                        df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float32)
+
                 return df
 
         return None
@@ -158,12 +570,37 @@ class FTUIClient:
 
         return (0, 0)
 
+    def _compact_trades(self, trades) -> list:
+        compact = [ClosedTrade(t) for t in trades]
+        if trades:
+            # keys are shared between the dicts of one response, so count them once
+            seen = set()
+            sample = trades[: self.RAW_SIZE_SAMPLE]
+            self.raw_trade_bytes = sum(deep_size(t, seen) for t in sample) / len(sample)
+
+            seen = set()
+            sample = compact[: self.RAW_SIZE_SAMPLE]
+            self.compact_trade_bytes = sum(deep_size(t, seen) for t in sample) / len(sample)
+        return compact
+
     def get_all_closed_trades(self) -> list:
+        # while the stream is up, only exit fills can change the closed trades
+        if (
+            self.stream_connected
+            and not self.closed_trades_dirty
+            and monotonic() - self.last_closed_trades_check < self.STREAM_SAFETY_REFRESH
+        ):
+            return self.all_closed_trades
+
         cl = self.rest_client
         ps = cl.profit()
 
-        if ps is not None:
+        if ps is not None and "closed_trade_count" in ps:
+            self.closed_trades_dirty = False
+            self.last_closed_trades_check = monotonic()
+
             num_all_closed_trades = int(ps["closed_trade_count"])
+            self._set_closed_trade_count(num_all_closed_trades)
 
             if num_all_closed_trades != self.prev_closed_trade_count:
                 m, r = divmod(int(num_all_closed_trades), 500)
@@ -175,33 +612,33 @@ class FTUIClient:
                     if cltrades is not None and "trades" in cltrades:
                         clt = cltrades["trades"]
                         if clt is not None and len(clt) > 0:
-                            trades.extend(clt)
+                            trades.extend(self._compact_trades(clt))
 
                     for i in range(1, m + 1):
                         cltrades = cl.trades(offset=(500 * i))
                         if cltrades is not None and "trades" in cltrades:
                             clt = cltrades["trades"]
                             if clt is not None and len(clt) > 0:
-                                trades.extend(clt)
+                                trades.extend(self._compact_trades(clt))
 
                 elif m == 1:
                     cltrades = cl.trades()
                     if cltrades is not None and "trades" in cltrades:
                         clt = cltrades["trades"]
                         if clt is not None and len(clt) > 0:
-                            trades.extend(clt)
+                            trades.extend(self._compact_trades(clt))
 
                     cltrades = cl.trades(offset=500)
                     if cltrades is not None and "trades" in cltrades:
                         clt = cltrades["trades"]
                         if clt is not None and len(clt) > 0:
-                            trades.extend(clt)
+                            trades.extend(self._compact_trades(clt))
                 else:
                     cltrades = cl.trades()
                     if cltrades is not None and "trades" in cltrades:
                         clt = cltrades["trades"]
                         if clt is not None and len(clt) > 0:
-                            trades = clt
+                            trades = self._compact_trades(clt)
 
                 trades.reverse()
                 self.all_closed_trades = trades
@@ -209,12 +646,91 @@ class FTUIClient:
 
         return self.all_closed_trades
 
+    def _set_closed_trade_count(self, count):
+        """
+        Record the bot's closed trade count, dropping the cached blocks if it changed.
+
+        /trades is ordered by trade id, and a trade closing after trades with
+        higher ids shifts every block from its position on, so no block is
+        known to be current once the count has moved.
+        """
+        with self.closed_trade_blocks_lock:
+            if count != self.closed_trade_count:
+                self.closed_trade_blocks.clear()
+            self.closed_trade_count = count
+
+    def _get_closed_trade_block(self, block) -> list:
+        """
+        Closed trades [block * CLOSED_TRADE_BLOCK, (block + 1) * CLOSED_TRADE_BLOCK) by id.
+
+        Blocks are served from a bounded LRU cache for as long as the closed
+        trade count stays the same, see _set_closed_trade_count().
+        """
+        size = self.CLOSED_TRADE_BLOCK
+        with self.closed_trade_blocks_lock:
+            cached = self.closed_trade_blocks.get(block)
+            if cached is not None:
+                self.closed_trade_blocks.move_to_end(block)
+                return cached
+
+        cl = self.rest_client
+        cltrades = cl.trades(limit=size, offset=block * size)
+        if cltrades is None or "trades" not in cltrades:
+            return []
+
+        trades = self._compact_trades(cltrades["trades"])
+        if "total_trades" in cltrades:
+            self._set_closed_trade_count(int(cltrades["total_trades"]))
+
+        with self.closed_trade_blocks_lock:
+            self.closed_trade_blocks[block] = trades
+            self.closed_trade_blocks.move_to_end(block)
+            while len(self.closed_trade_blocks) > self.MAX_CACHED_BLOCKS:
+                self.closed_trade_blocks.popitem(last=False)
+
+        return trades
+
+    def get_closed_trades_page(self, page, page_size=CLOSED_TRADE_BLOCK) -> tuple:
+        """
+        One page of closed trades, newest first, and the total closed trade count.
+
+        Only the /trades blocks covering the page are requested, so the first
+        pages are available without downloading the whole history. The count
+        is checked against /profit on each call, as trades may have closed
+        since the cached blocks were fetched.
+        """
+        ps = self.rest_client.profit()
+        if ps is not None and "closed_trade_count" in ps:
+            self._set_closed_trade_count(int(ps["closed_trade_count"]))
+
+        total = self.closed_trade_count
+        if not total:
+            return [], 0
+
+        hi = max(total - page * page_size, 0)
+        lo = max(hi - page_size, 0)
+
+        size = self.CLOSED_TRADE_BLOCK
+        trades = []
+        for block in range(lo // size, (hi - 1) // size + 1 if hi > lo else lo // size):
+            trades.extend(self._get_closed_trade_block(block))
+
+        start = lo - (lo // size) * size
+        trades = trades[start : start + hi - lo]
+        trades.reverse()
+
+        return trades, total
+
     def get_open_trades(self) -> list:
         cl = self.rest_client
         ts = cl.status()
 
         trades = []
         if ts is not None:
+            # /status carries the full trade details, so opening one costs no request
+            if isinstance(ts, list):
+                for t in ts:
+                    self.trade_info[int(t["trade_id"])] = t
             return ts
         return trades
 
@@ -273,14 +789,34 @@ class FTUIClient:
         si = cl.sysinfo()
         return si
 
+    def get_balance(self, refresh=False) -> Optional[dict]:
+        if (
+            refresh
+            or self.balance is None
+            or monotonic() - self.last_balance_check > self.BALANCE_REFRESH
+        ):
+            bal = self.rest_client.balance()
+            if bal is not None and "currencies" in bal:
+                self.balance = bal
+                self.last_balance_check = monotonic()
+
+        return self.balance
+
+    def stake_balance(self) -> Optional[dict]:
+        """The cached /balance entry for the stake currency, without requesting it"""
+        if self.balance is None:
+            return None
+
+        stake_currency = self.get_client_config()["stake_currency"]
+        for b in self.balance["currencies"]:
+            if b["currency"] == stake_currency:
+                return b
+        return None
+
     def calc_risk(self):
-        cl = self.rest_client
-        bal = cl.balance()
-        avail_bal = 0
-        for b in bal["currencies"]:
-            if b["currency"] == self.config["stake_currency"]:
-                avail_bal = b["balance"]
-                break
+        self.get_balance()
+        stake_bal = self.stake_balance()
+        avail_bal = stake_bal["balance"] if stake_bal is not None else 0
 
         if self.config["max_open_trades"] > 0:
             max_capit = 0
@@ -297,9 +833,55 @@ class FTUIClient:
         else:
             return 0
 
-    def get_trade_info(self, trade_id: int):
+    def memory_report(self) -> dict:
+        """
+        Memory held by the closed trade history, against keeping the API dicts.
+
+        Sizes are estimated from the mean size of a few sampled records, so the
+        report costs the same however many trades are held.
+        """
+        trades = self.all_closed_trades
+
+        compact = raw = 0
+        if trades and self.compact_trade_bytes is not None:
+            compact = int(self.compact_trade_bytes * len(trades)) + sys.getsizeof(trades)
+        if trades and self.raw_trade_bytes is not None:
+            raw = int(self.raw_trade_bytes * len(trades)) + sys.getsizeof(trades)
+
+        with self.closed_trade_blocks_lock:
+            paged_trades = sum(len(b) for b in self.closed_trade_blocks.values())
+
+        details = dict(self.trade_info)
+        details_bytes = 0
+        if details:
+            sample = list(islice(details.values(), self.RAW_SIZE_SAMPLE))
+            details_bytes = int(sum(deep_size(t) for t in sample) / len(sample) * len(details))
+
+        return {
+            "closed_trades": len(trades),
+            "compact_bytes": compact,
+            "raw_bytes": raw,
+            "paged_trades": paged_trades,
+            "paged_bytes": int((self.compact_trade_bytes or 0) * paged_trades),
+            "trade_details": len(details),
+            "trade_details_bytes": details_bytes,
+        }
+
+    def cached_trade_info(self, trade_id: int) -> Optional[dict]:
+        return self.trade_info.get(int(trade_id))
+
+    def get_trade_info(self, trade_id: int, use_cache=True):
+        trade_id = int(trade_id)
+
+        if use_cache:
+            t = self.trade_info.get(trade_id)
+            if t is not None and not t.get("is_open", True):
+                return t
+
         cl = self.rest_client
         t = cl.trade(trade_id)
+        if t is not None and "trade_id" in t:
+            self.trade_info[trade_id] = t
         return t
 
 
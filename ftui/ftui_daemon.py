@@ -0,0 +1,369 @@
+"""
+Aggregator daemon serving several FTUI frontends.
+
+The daemon polls the fleet on behalf of every connected frontend: each
+(bot, data type) is fetched at most once per FRESH_FOR seconds however many
+frontends ask for it, and only while some frontend asks. Frames are sent in
+the columnar layout of ftui_engine over a Unix socket or TCP connection.
+
+Messages are a big-endian (header length, payload length) pair, a JSON
+header and the raw column data as payload. Frontends can also ask for the
+daemon's bots and their configs, so they need not ask the bots themselves.
+"""
+
+import logging
+import os
+import socket
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+import rapidjson
+
+from ftui.ftui_engine import SnapshotReceiver, copy_arrays, decode_frame, encode_frame
+from ftui.ftui_frames import FRAME_BUILDERS
+
+logger = logging.getLogger("ftui_daemon")
+
+MESSAGE_HEADER = struct.Struct(">II")
+
+
+def parse_address(address) -> tuple:
+    """'unix:/path', '/path' or 'host:port' to a socket family and address"""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:") :]
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+def bot_address(cl) -> str:
+    return f"{cl.url}:{cl.port}"
+
+
+def adopt_daemon_bots(client_dict, bots) -> dict:
+    """
+    Match the (lazy) clients of a frontend to the daemon's bots by address:
+    each takes the daemon's name and config of its bot. Returns the clients
+    by their new names.
+    """
+    by_address = {b["address"]: b for b in bots}
+    adopted = {}
+    for cl in client_dict.values():
+        bot = by_address.get(bot_address(cl))
+        if bot is not None:
+            cl.name = bot["name"]
+            cl.config = bot["config"]
+        adopted[cl.name] = cl
+    return adopted
+
+
+def send_message(sock, header, payload=b""):
+    head = rapidjson.dumps(header, number_mode=rapidjson.NM_NATIVE | rapidjson.NM_NAN, default=str)
+    head = head.encode()
+    sock.sendall(MESSAGE_HEADER.pack(len(head), len(payload)) + head)
+    if payload:
+        sock.sendall(payload)
+
+
+def _recv_exactly(sock, n) -> bytearray:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    while n:
+        read = sock.recv_into(view[-n:], n)
+        if read == 0:
+            raise ConnectionError("Connection closed")
+        n -= read
+    return buf
+
+
+def recv_message(sock) -> tuple:
+    head_len, payload_len = MESSAGE_HEADER.unpack(_recv_exactly(sock, MESSAGE_HEADER.size))
+    header = rapidjson.loads(
+        bytes(_recv_exactly(sock, head_len)), number_mode=rapidjson.NM_NATIVE | rapidjson.NM_NAN
+    )
+    payload = _recv_exactly(sock, payload_len) if payload_len else bytearray()
+    return header, payload
+
+
+class FrontendConnection:
+    def __init__(self, sock, peer):
+        self.sock = sock
+        self.peer = peer
+        self.versions = {}
+        self._send_lock = threading.Lock()
+
+    def send(self, header, payload=b"") -> bool:
+        try:
+            with self._send_lock:
+                send_message(self.sock, header, payload)
+            return True
+        except OSError:
+            return False
+
+
+class AggregatorDaemon:
+    """Polls the bots once for any number of frontends and caches the frames"""
+
+    # a cached frame younger than this is served without asking the bot again
+    FRESH_FOR = 5
+
+    def __init__(self, client_dict, fresh_for=FRESH_FOR):
+        self.client_dict = client_dict
+        self.fresh_for = fresh_for
+
+        # (bot, data type) -> dict(version, fetched, stale, columns, payload)
+        self.cache = {}
+        # (bot, data type) being fetched -> frontends waiting for it
+        self.waiting = {}
+        self.connections = set()
+        self._lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=min(max(len(client_dict), 1), 16))
+
+    def _send_entry(self, conn, key, entry):
+        header = {"op": "current", "bot": key[0], "data_type": key[1]}
+        payload = b""
+        if conn.versions.get(key) != entry["version"]:
+            header.update(op="snapshot", columns=entry["columns"])
+            payload = entry["payload"]
+        header.update(version=entry["version"], stale=entry["stale"])
+
+        if conn.send(header, payload):
+            conn.versions[key] = entry["version"]
+
+    def handle_fetch(self, conn, wanted):
+        now = monotonic()
+        ready, failed, to_build = [], {}, {}
+
+        with self._lock:
+            for bot, data_types in wanted.items():
+                for data_type in data_types:
+                    key = (bot, data_type)
+                    if bot not in self.client_dict or data_type not in FRAME_BUILDERS:
+                        failed.setdefault(bot, []).append(data_type)
+                        continue
+
+                    entry = self.cache.get(key)
+                    if entry is not None and now - entry["fetched"] < self.fresh_for:
+                        ready.append((key, entry))
+                        continue
+
+                    if key not in self.waiting:
+                        to_build.setdefault(bot, []).append(data_type)
+                    self.waiting.setdefault(key, set()).add(conn)
+
+        for key, entry in ready:
+            self._send_entry(conn, key, entry)
+        for bot, data_types in failed.items():
+            conn.send({"op": "failed", "bot": bot, "data_types": data_types})
+        for bot, data_types in to_build.items():
+            self.executor.submit(self.build, bot, data_types)
+
+    def build(self, bot, data_types):
+        cl = self.client_dict[bot]
+        for data_type in data_types:
+            key = (bot, data_type)
+            entry = None
+            try:
+                if cl.is_available():
+                    layout, size, arrays = encode_frame(FRAME_BUILDERS[data_type](cl))
+                    payload = bytearray(size)
+                    copy_arrays(memoryview(payload), arrays)
+                    entry = {
+                        "fetched": monotonic(),
+                        "stale": cl.is_stale,
+                        "columns": layout,
+                        "payload": payload,
+                    }
+            except Exception as e:
+                logger.warning(f"Failed to update data for {bot}: {e}")
+
+            with self._lock:
+                prev = self.cache.get(key)
+                if entry is not None:
+                    entry["version"] = prev["version"] + 1 if prev is not None else 1
+                    self.cache[key] = entry
+                elif prev is not None:
+                    # serve the last good frame, marked stale, as the in-process FTUI does
+                    prev["stale"] = True
+                    entry = prev
+                conns = self.waiting.pop(key, set())
+
+            for conn in conns:
+                if entry is not None:
+                    self._send_entry(conn, key, entry)
+                else:
+                    conn.send({"op": "failed", "bot": bot, "data_types": [data_type]})
+
+    def bot_list(self) -> list:
+        return [
+            {"name": name, "address": bot_address(cl), "config": cl.get_client_config()}
+            for name, cl in self.client_dict.items()
+        ]
+
+    def handle_connection(self, sock, peer):
+        conn = FrontendConnection(sock, peer)
+        with self._lock:
+            self.connections.add(conn)
+        logger.info(f"Frontend connected: {peer}")
+
+        try:
+            while True:
+                header, _ = recv_message(sock)
+                op = header.get("op")
+                if op == "fetch":
+                    self.handle_fetch(conn, header.get("wanted", {}))
+                elif op == "bots":
+                    conn.send({"op": "bots", "bots": self.bot_list()})
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self.connections.discard(conn)
+                for conns in self.waiting.values():
+                    conns.discard(conn)
+            sock.close()
+            logger.info(f"Frontend disconnected: {peer}")
+
+    def serve(self, address):
+        family, addr = parse_address(address)
+        server = socket.socket(family, socket.SOCK_STREAM)
+
+        if family == socket.AF_UNIX:
+            if os.path.exists(addr):
+                os.unlink(addr)
+        else:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        server.bind(addr)
+        server.listen()
+        print(f"FTUI daemon serving {len(self.client_dict)} bots on {address}", flush=True)
+
+        try:
+            while True:
+                sock, peer = server.accept()
+                threading.Thread(
+                    target=self.handle_connection,
+                    args=(sock, peer or address),
+                    name="ftui-daemon-frontend",
+                    daemon=True,
+                ).start()
+        finally:
+            server.close()
+            if family == socket.AF_UNIX and os.path.exists(addr):
+                os.unlink(addr)
+
+
+class RemoteEngine(SnapshotReceiver):
+    """Frontend side of the daemon, used by the UI in place of a DataEngine"""
+
+    def __init__(self, address, on_snapshot, on_failed):
+        super().__init__(on_snapshot, on_failed)
+        self.address = address
+        self.sock = None
+        self._connect_lock = threading.Lock()
+
+        self._bots = []
+        self._bots_received = threading.Event()
+
+    def start(self):
+        self._connect()
+
+    def _connect(self) -> bool:
+        with self._connect_lock:
+            if self.sock is not None:
+                return True
+
+            family, addr = parse_address(self.address)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            try:
+                sock.connect(addr)
+            except OSError as e:
+                sock.close()
+                logger.warning(f"Could not connect to FTUI daemon at {self.address}: {e}")
+                return False
+
+            # a restarted daemon numbers its snapshots from scratch
+            self.versions = {}
+            self.sock = sock
+            threading.Thread(
+                target=self._listen, args=(sock,), name="ftui-daemon-listener", daemon=True
+            ).start()
+            return True
+
+    def _disconnect(self, sock):
+        with self._connect_lock:
+            if self.sock is sock:
+                self.sock = None
+        sock.close()
+
+    def request(self, wanted, callback=None):
+        """Fetch {bot: data_types} through the daemon"""
+        wanted = {bot: list(dt) for bot, dt in wanted.items() if dt}
+        self._expect(wanted, callback)
+        if not wanted:
+            return
+
+        sock = self.sock
+        if sock is None and self._connect():
+            sock = self.sock
+
+        try:
+            if sock is None:
+                raise ConnectionError("Not connected")
+            send_message(sock, {"op": "fetch", "wanted": wanted})
+        except OSError:
+            if sock is not None:
+                self._disconnect(sock)
+            for bot, data_types in wanted.items():
+                self._fail(bot, data_types)
+
+    def bots(self, timeout=10) -> list:
+        """The daemon's bots as dicts of name, address and config, empty if it does not answer"""
+        sock = self.sock
+        if sock is None and self._connect():
+            sock = self.sock
+        if sock is None:
+            return []
+
+        self._bots_received.clear()
+        try:
+            send_message(sock, {"op": "bots"})
+        except OSError:
+            self._disconnect(sock)
+            return []
+
+        if not self._bots_received.wait(timeout):
+            return []
+        return self._bots
+
+    def _listen(self, sock):
+        try:
+            while True:
+                header, payload = recv_message(sock)
+                try:
+                    op = header["op"]
+                    if op == "snapshot":
+                        self._deliver(header, lambda h=header, p=payload: decode_frame(h["columns"], p))
+                    elif op == "current":
+                        if header.get("stale"):
+                            # the frame we hold is the daemon's last good one, its bot is down
+                            self._fail(header["bot"], [header["data_type"]])
+                        else:
+                            self._resolve({(header["bot"], header["data_type"])})
+                    elif op == "failed":
+                        self._fail(header["bot"], header["data_types"])
+                    elif op == "bots":
+                        self._bots = header["bots"]
+                        self._bots_received.set()
+                except Exception as e:
+                    logger.warning(f"Could not apply daemon update: {e}")
+        except (ConnectionError, OSError, ValueError):
+            self._disconnect(sock)
+
+    def stop(self):
+        sock = self.sock
+        if sock is not None:
+            self._disconnect(sock)
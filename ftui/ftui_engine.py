@@ -0,0 +1,357 @@
+"""
+Optional data engine process for the FTUI.
+
+In engine mode the bot polling and the dataframe building run in a separate
+process, away from the GIL of the UI's event loop. Every rebuilt frame is
+published as a versioned columnar snapshot in a shared memory segment, and
+the UI process only copies the columns out of it and renders them.
+"""
+
+import contextlib
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("ftui_engine")
+
+INDEX_COLUMN = "__index__"
+
+
+def client_spec(cl) -> dict:
+    """Arguments to build cl again in the engine, under the name the UI knows it by"""
+    return {**cl.spec, "name": cl.name}
+
+
+def encode_frame(df: pd.DataFrame) -> tuple:
+    """
+    Columnar layout of df: one contiguous array per column.
+
+    Numeric, date and duration columns are stored as their raw numpy data;
+    object and string columns are dictionary encoded, with the codes in the
+    arrays and the (few) distinct values carried in the layout. Returns the
+    layout, the total size in bytes and the (offset, array) pairs to copy.
+    """
+    columns = []
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        columns.append((INDEX_COLUMN, pd.Series(df.index)))
+    columns += [(c, df[c]) for c in df.columns]
+
+    arrays, layout = [], []
+    offset = 0
+    for name, values in columns:
+        dtype = str(values.dtype)
+        tz = None
+        categories = None
+
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            tz = str(values.dtype.tz)
+            data = values.dt.tz_convert(None).to_numpy()
+        else:
+            data = values.to_numpy()
+
+        if data.dtype == object:
+            codes, uniques = pd.factorize(data, use_na_sentinel=False)
+            data = codes.astype(np.int32)
+            categories = list(uniques)
+
+        data = np.ascontiguousarray(data)
+        # keep every column 8 byte aligned
+        offset = -(-offset // 8) * 8
+        layout.append((name, dtype, tz, data.dtype.str, offset, len(data), categories))
+        arrays.append((offset, data))
+        offset += data.nbytes
+
+    return layout, offset, arrays
+
+
+def copy_arrays(buf, arrays):
+    for start, data in arrays:
+        buf[start : start + data.nbytes] = data.view(np.uint8).reshape(-1)
+
+
+def decode_frame(layout, buf) -> pd.DataFrame:
+    """Rebuild a frame from its layout, copying the columns out of buf"""
+    cols = {}
+    for name, dtype, tz, raw_dtype, offset, length, categories in layout:
+        raw = np.frombuffer(buf, dtype=raw_dtype, count=length, offset=offset).copy()
+
+        if categories is not None:
+            values = np.empty(len(categories), dtype=object)
+            values[:] = categories
+            col = pd.Series(values[raw], dtype=object)
+            if dtype != "object":
+                col = col.astype(dtype)
+        else:
+            col = pd.Series(raw)
+            if tz is not None:
+                col = col.dt.tz_localize("UTC").dt.tz_convert(tz)
+
+        cols[name] = col
+
+    index = cols.pop(INDEX_COLUMN, None)
+    df = pd.DataFrame(cols)
+    if index is not None:
+        df.index = pd.Index(index)
+    return df
+
+
+def write_snapshot(df: pd.DataFrame) -> dict:
+    """Copy df into a new shared memory segment"""
+    layout, size, arrays = encode_frame(df)
+
+    shm = SharedMemory(create=True, size=max(size, 1))
+    try:
+        copy_arrays(shm.buf, arrays)
+    finally:
+        shm.close()
+
+    return {"shm": shm.name, "columns": layout}
+
+
+def read_snapshot(meta) -> pd.DataFrame:
+    """Build the frame of a snapshot, then release its shared memory segment"""
+    shm = SharedMemory(name=meta["shm"])
+    try:
+        return decode_frame(meta["columns"], shm.buf)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def discard_snapshot(meta):
+    try:
+        shm = SharedMemory(name=meta["shm"])
+        shm.close()
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# what building or reading a frame may raise: the clients hand back None for
+# failed requests, and a snapshot's shared memory segment can be gone
+BUILD_ERRORS = (AttributeError, KeyError, OSError, TypeError, ValueError)
+
+
+def run_engine(specs, requests, results):
+    """Entry point of the engine process"""
+    # the UI owns the terminal
+    with (
+        open(os.devnull, "w") as devnull,
+        contextlib.redirect_stdout(devnull),
+        contextlib.redirect_stderr(devnull),
+    ):
+        _serve(specs, requests, results)
+
+
+def _serve(specs, requests, results):
+    from ftui.ftui_client import FTUIClient
+    from ftui.ftui_frames import FRAME_BUILDERS
+
+    client_dict = {}
+    for spec in specs:
+        try:
+            cl = FTUIClient(**spec)
+            client_dict[spec["name"]] = cl
+        except (KeyError, OSError, TypeError, ValueError) as e:
+            logger.warning(f"Engine could not set up {spec['name']}: {e}")
+
+    parent = os.getppid()
+    versions = {}
+    pending = set()
+    lock = threading.Lock()
+
+    def build(name, data_types):
+        cl = client_dict.get(name)
+        try:
+            if cl is None or not cl.is_available():
+                results.put(("failed", name, data_types))
+                return
+
+            for data_type in data_types:
+                frame = FRAME_BUILDERS[data_type](cl)
+                meta = write_snapshot(frame)
+
+                with lock:
+                    versions[(name, data_type)] = versions.get((name, data_type), 0) + 1
+                    meta.update(
+                        bot=name,
+                        data_type=data_type,
+                        version=versions[(name, data_type)],
+                        stale=cl.is_stale,
+                    )
+                results.put(("snapshot", meta))
+        except BUILD_ERRORS as e:
+            logger.warning(f"Engine failed to update data for {name}: {e}")
+            results.put(("failed", name, data_types))
+        finally:
+            with lock:
+                pending.difference_update((name, d) for d in data_types)
+
+    with ThreadPoolExecutor(max_workers=min(max(len(client_dict), 1), 16)) as executor:
+        while True:
+            try:
+                msg = requests.get(timeout=1)
+            except queue.Empty:
+                if os.getppid() != parent:
+                    break
+                continue
+
+            if msg[0] == "stop":
+                break
+
+            _, name, data_types = msg
+            with lock:
+                # a refresh already queued for this data covers the new request
+                data_types = tuple(d for d in data_types if (name, d) not in pending)
+                pending.update((name, d) for d in data_types)
+
+            if data_types:
+                executor.submit(build, name, data_types)
+
+
+class SnapshotReceiver:
+    """
+    Hands snapshots from an engine to the UI.
+
+    Snapshots are passed to on_snapshot(bot, data_type, frame, stale) and
+    failures to on_failed(bot, data_types). Snapshots older than the version
+    already delivered for that data are dropped. Callbacks given with a
+    request run once all the data asked for has arrived or failed.
+    """
+
+    def __init__(self, on_snapshot, on_failed):
+        self.on_snapshot = on_snapshot
+        self.on_failed = on_failed
+
+        self.versions = {}
+        self.callbacks = []
+        self._lock = threading.Lock()
+
+    def _expect(self, wanted, callback):
+        if callback is None:
+            return
+
+        outstanding = {(bot, d) for bot, dt in wanted.items() for d in dt}
+        if outstanding:
+            with self._lock:
+                self.callbacks.append((outstanding, callback))
+        else:
+            callback()
+
+    def _resolve(self, done):
+        ready = []
+        with self._lock:
+            for outstanding, callback in self.callbacks:
+                outstanding.difference_update(done)
+                if not outstanding:
+                    ready.append(callback)
+            self.callbacks = [(o, c) for o, c in self.callbacks if o]
+
+        for callback in ready:
+            callback()
+
+    def _deliver(self, meta, read, discard=None):
+        """Apply a snapshot described by meta, read() builds its frame"""
+        key = (meta["bot"], meta["data_type"])
+        try:
+            if meta["version"] <= self.versions.get(key, 0):
+                if discard is not None:
+                    discard()
+                return
+
+            self.versions[key] = meta["version"]
+            self.on_snapshot(meta["bot"], meta["data_type"], read(), meta["stale"])
+        finally:
+            self._resolve({key})
+
+    def _fail(self, bot, data_types):
+        try:
+            self.on_failed(bot, data_types)
+        finally:
+            self._resolve({(bot, d) for d in data_types})
+
+
+class DataEngine(SnapshotReceiver):
+    """UI side of the engine process, see SnapshotReceiver"""
+
+    def __init__(self, client_dict, on_snapshot, on_failed):
+        super().__init__(on_snapshot, on_failed)
+        self.specs = [client_spec(cl) for cl in client_dict.values()]
+
+        ctx = mp.get_context("spawn")
+        self.requests = ctx.Queue()
+        self.results = ctx.Queue()
+        self.process = ctx.Process(
+            target=run_engine,
+            args=(self.specs, self.requests, self.results),
+            name="ftui-engine",
+            daemon=True,
+        )
+
+        self.listener = threading.Thread(
+            target=self._listen, name="ftui-engine-listener", daemon=True
+        )
+        self.running = False
+
+    def start(self):
+        self.process.start()
+        self.running = True
+        self.listener.start()
+
+    def request(self, wanted, callback=None):
+        """Fetch {bot: data_types}"""
+        wanted = {bot: tuple(dt) for bot, dt in wanted.items() if dt}
+        self._expect(wanted, callback)
+
+        for bot, data_types in wanted.items():
+            self.requests.put(("fetch", bot, data_types))
+
+    def _listen(self):
+        while self.running:
+            try:
+                msg = self.results.get(timeout=1)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    break
+                continue
+            except (EOFError, OSError):
+                break
+
+            try:
+                if msg[0] == "snapshot":
+                    meta = msg[1]
+                    self._deliver(
+                        meta, partial(read_snapshot, meta), partial(discard_snapshot, meta)
+                    )
+                else:
+                    self._fail(msg[1], msg[2])
+            except BUILD_ERRORS as e:
+                logger.warning(f"Could not apply engine update: {e}")
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+
+        self.requests.put(("stop",))
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.listener.join(timeout=2)
+
+        # release snapshots that were published but never read
+        while True:
+            try:
+                msg = self.results.get_nowait()
+            except (queue.Empty, EOFError, OSError):
+                break
+            if msg[0] == "snapshot":
+                discard_snapshot(msg[1])
@@ -0,0 +1,403 @@
+"""Fleet-wide views over the per-bot data held by the FTUI"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class FleetTradeView:
+    """
+    Read-only view over one data type (e.g. "cl_data") of several bots.
+
+    The per-bot frames in client_dfs are used as partitions and are never
+    concatenated wholesale: filters are applied per partition, top-N picks
+    the best rows of each partition before merging, and sorting only gathers
+    the sort column to build a (partition, row) index.
+    """
+
+    def __init__(self, client_dfs, data_type, bots=None, partitions=None):
+        self.data_type = data_type
+
+        if partitions is None:
+            if bots is None:
+                bots = client_dfs.keys()
+
+            partitions = []
+            for bot in bots:
+                df = client_dfs.get(bot, {}).get(data_type)
+                if df is not None and not df.empty:
+                    partitions.append((bot, df))
+
+        self.partitions = partitions
+
+    def __len__(self):
+        return sum(len(df) for _, df in self.partitions)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def columns(self):
+        if self.partitions:
+            return self.partitions[0][1].columns
+        return pd.Index([])
+
+    def column(self, name) -> np.ndarray:
+        """One column of the whole view as a single array"""
+        if self.empty:
+            return np.zeros(0)
+        return np.concatenate([df[name].to_numpy() for _, df in self.partitions])
+
+    def filter(self, func) -> "FleetTradeView":
+        """New view keeping the rows where func(df) is True, per partition"""
+        partitions = []
+        for bot, df in self.partitions:
+            sel = df.loc[func(df)]
+            if not sel.empty:
+                partitions.append((bot, sel))
+        return FleetTradeView(None, self.data_type, partitions=partitions)
+
+    def head(self, n) -> "FleetTradeView":
+        """New view with the first n rows of each partition"""
+        return FleetTradeView(
+            None, self.data_type, partitions=[(bot, df.iloc[:n]) for bot, df in self.partitions]
+        )
+
+    def top_n(self, n, by, ascending=False) -> pd.DataFrame:
+        """The n rows with the largest (or smallest) `by` across the fleet"""
+        if self.empty:
+            return pd.DataFrame()
+
+        if ascending:
+            parts = [df.nsmallest(n, by) for _, df in self.partitions]
+        else:
+            parts = [df.nlargest(n, by) for _, df in self.partitions]
+
+        return pd.concat(parts).sort_values(by=by, ascending=ascending).iloc[:n]
+
+    def sort_index(self, by, ascending=True):
+        """
+        (partition number, row position) arrays giving the fleet-wide order on `by`.
+
+        Only the sort column is gathered, rows are materialized later with take().
+        """
+        if self.empty:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64)
+
+        keys = self.column(by)
+        part = np.concatenate(
+            [np.full(len(df), i, dtype=np.int32) for i, (_, df) in enumerate(self.partitions)]
+        )
+        rows = np.concatenate([np.arange(len(df)) for _, df in self.partitions])
+
+        order = np.argsort(keys, kind="stable")
+        if not ascending:
+            order = order[::-1]
+
+        return part[order], rows[order]
+
+    def take(self, part, rows) -> pd.DataFrame:
+        """Materialize the given (partition number, row position) pairs, in order"""
+        if len(part) == 0:
+            return pd.DataFrame(columns=self.columns)
+
+        pieces = []
+        positions = []
+        for i in np.unique(part):
+            mask = part == i
+            pieces.append(self.partitions[i][1].iloc[rows[mask]])
+            positions.append(np.flatnonzero(mask))
+
+        order = np.argsort(np.concatenate(positions), kind="stable")
+        return pd.concat(pieces).iloc[order]
+
+    def sort_values(self, by, ascending=True, limit=None) -> pd.DataFrame:
+        part, rows = self.sort_index(by, ascending=ascending)
+        if limit is not None:
+            part, rows = part[:limit], rows[:limit]
+        return self.take(part, rows)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Concatenate the whole view; for callers that really need one frame"""
+        if self.empty:
+            return pd.DataFrame()
+        return pd.concat([df for _, df in self.partitions])
+
+
+class _BotTradeIndex:
+    """Inverted indexes and sorted range arrays over one bot's trade frame"""
+
+    def __init__(self, trades, category_columns, range_columns):
+        self.trades = trades
+        self.signature = FleetTradeIndex.signature(trades)
+
+        # value -> row positions, values compared case-insensitively
+        self.inverted = {}
+        for col in category_columns:
+            if col not in trades.columns:
+                continue
+            codes, uniques = pd.factorize(trades[col].fillna("None").astype(str).str.lower())
+            order = np.argsort(codes, kind="stable")
+            bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(uniques)))))
+            self.inverted[col] = {
+                value: order[bounds[i] : bounds[i + 1]] for i, value in enumerate(uniques)
+            }
+
+        # (sorted values, row positions in that order)
+        self.ranges = {}
+        for col in range_columns:
+            if col not in trades.columns:
+                continue
+            values = trades[col].to_numpy()
+            if np.issubdtype(values.dtype, np.datetime64):
+                values = values.astype("datetime64[ns]").astype(np.int64)
+            else:
+                values = values.astype(float)
+            order = np.argsort(values, kind="stable")
+            self.ranges[col] = (values[order], order)
+
+    def rows_in(self, col, values):
+        index = self.inverted.get(col, {})
+        rows = [index[v.lower()] for v in values if v.lower() in index]
+        return np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+
+    def rows_between(self, col, lo, hi):
+        sorted_values, order = self.ranges[col]
+        i = 0 if lo is None else np.searchsorted(sorted_values, lo, side="left")
+        j = len(sorted_values) if hi is None else np.searchsorted(sorted_values, hi, side="right")
+        return order[i:j]
+
+
+class FleetTradeIndex:
+    """
+    Search indexes over the trades of every bot, kept up to date per bot.
+
+    Category columns (pair, tags, direction) get inverted indexes and range
+    columns (dates, profit) sorted arrays, so a query is a few dict lookups
+    and binary searches per bot, combined as row masks. A bot's indexes are
+    only rebuilt when its trades change.
+    """
+
+    CATEGORY_COLUMNS = ("Pair", "Entry", "Exit", "S/L")
+    RANGE_COLUMNS = ("Close Date", "Profit %")
+
+    def __init__(self):
+        self.indexes = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def signature(trades):
+        ids = trades["ID"].to_numpy()
+        return (len(ids), ids.min(), ids.max(), ids.sum())
+
+    def update(self, bot, trades: pd.DataFrame) -> bool:
+        if trades is None or trades.empty or "ID" not in trades.columns:
+            with self._lock:
+                return self.indexes.pop(bot, None) is not None
+
+        index = self.indexes.get(bot)
+        if index is not None and index.signature == self.signature(trades):
+            return False
+
+        index = _BotTradeIndex(trades, self.CATEGORY_COLUMNS, self.RANGE_COLUMNS)
+        with self._lock:
+            self.indexes[bot] = index
+        return True
+
+    def query(self, categories=None, ranges=None, bots=None) -> FleetTradeView:
+        """
+        Trades matching every given filter, as a view partitioned by bot.
+
+        `categories` map a category column to a list of accepted values,
+        `ranges` map a range column to a (lo, hi) tuple with None for an open
+        end. Dates are compared as naive UTC timestamps.
+        """
+        with self._lock:
+            indexes = dict(self.indexes)
+
+        if bots:
+            wanted = {b.lower() for b in bots}
+            indexes = {b: i for b, i in indexes.items() if b.lower() in wanted}
+
+        partitions = []
+        for bot, index in indexes.items():
+            n = len(index.trades)
+            mask = np.ones(n, dtype=bool)
+
+            for col, values in (categories or {}).items():
+                if values:
+                    sel = np.zeros(n, dtype=bool)
+                    sel[index.rows_in(col, values)] = True
+                    mask &= sel
+
+            for col, (lo, hi) in (ranges or {}).items():
+                if (lo is not None or hi is not None) and col in index.ranges:
+                    if col == "Close Date":
+                        lo = None if lo is None else pd.Timestamp(lo).value
+                        hi = None if hi is None else pd.Timestamp(hi).value
+                    sel = np.zeros(n, dtype=bool)
+                    sel[index.rows_between(col, lo, hi)] = True
+                    mask &= sel
+
+            if mask.any():
+                partitions.append((bot, index.trades.iloc[np.flatnonzero(mask)]))
+
+        return FleetTradeView(None, "cl_data", partitions=partitions)
+
+
+class FleetPairPerformance:
+    """
+    Per-pair performance summed over the fleet from each bot's /performance.
+
+    When a bot's rows change, its previous contribution is subtracted from
+    the fleet totals and the new one added, so an update only touches that
+    bot's pairs instead of re-merging every bot.
+    """
+
+    COLUMNS = ["# Bots", "# Trades", "Total Profit", "pct_sum"]
+
+    def __init__(self):
+        self.bot_perf = {}
+        self.totals = pd.DataFrame(columns=self.COLUMNS, dtype=float)
+        self.version = 0
+        self._table = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _contribution(cls, perf) -> pd.DataFrame:
+        if perf is None or perf.empty:
+            return pd.DataFrame(columns=cls.COLUMNS, dtype=float)
+
+        trades = perf["# Trades"].to_numpy(dtype=float)
+        contrib = pd.DataFrame(
+            {
+                "# Bots": 1.0,
+                "# Trades": trades,
+                "Total Profit": perf["Total Profit"].to_numpy(dtype=float),
+                # weighted so the fleet average is per trade, not per bot
+                "pct_sum": perf["Avg Profit %"].to_numpy(dtype=float) * trades,
+            },
+            index=perf["Pair"].to_numpy(),
+        )
+        return contrib.groupby(level=0).sum()
+
+    def update(self, bot, perf: pd.DataFrame) -> bool:
+        new = self._contribution(perf)
+
+        with self._lock:
+            old = self.bot_perf.get(bot)
+            if old is not None and old.equals(new):
+                return False
+
+            totals = self.totals
+            if old is not None:
+                totals = totals.sub(old, fill_value=0)
+            totals = totals.add(new, fill_value=0)
+
+            self.totals = totals.loc[totals["# Bots"] > 0.5]
+            self.bot_perf[bot] = new
+            self.version += 1
+            self._table = None
+
+        return True
+
+    def table(self, bots=None) -> pd.DataFrame:
+        """Fleet pair performance, best total profit first"""
+        with self._lock:
+            if bots is None or set(bots) >= set(self.bot_perf):
+                if self._table is not None:
+                    return self._table
+                totals = self.totals
+                cache = True
+            else:
+                parts = [self.bot_perf[b] for b in bots if b in self.bot_perf]
+                totals = pd.concat(parts).groupby(level=0).sum() if parts else self.totals.iloc[:0]
+                cache = False
+
+        trades = totals["# Trades"]
+        table = pd.DataFrame(
+            {
+                "Pair": totals.index,
+                "# Bots": totals["# Bots"].round().astype(int).to_numpy(),
+                "# Trades": trades.round().astype(int).to_numpy(),
+                "Avg Profit %": (totals["pct_sum"] / trades.where(trades > 0)).fillna(0).to_numpy(),
+                "Total Profit": totals["Total Profit"].to_numpy(),
+            }
+        ).sort_values(by="Total Profit", ascending=False, ignore_index=True)
+
+        if cache:
+            with self._lock:
+                self._table = table
+        return table
+
+
+def fleet_exposure(open_view: FleetTradeView, stake_currencies, stake_balances):
+    """
+    Stake held in open trades across the fleet, per stake currency and per pair.
+
+    Works only from the open trade frames and the bots' cached stake currency
+    balances (bot -> /balance entry or None), so it needs no requests.
+    Returns (currency frame, pair frame), each sorted by stake.
+    """
+    parts = [
+        pd.DataFrame(
+            {
+                "Bot": bot,
+                "Currency": stake_currencies.get(bot),
+                "Pair": df["Pair"].str.split(" ").str[0].to_numpy(),
+                "Stake": df["Stake Amount"].to_numpy(dtype=float),
+            }
+        )
+        for bot, df in open_view.partitions
+    ]
+    trades = (
+        pd.concat(parts, ignore_index=True)
+        if parts
+        else pd.DataFrame(columns=["Bot", "Currency", "Pair", "Stake"])
+    )
+
+    balances = pd.DataFrame(
+        [
+            {
+                "Bot": bot,
+                "Currency": stake_currencies.get(bot),
+                "Free": float(bal.get("free") or 0),
+                "Total": float(bal.get("balance") or 0),
+            }
+            for bot, bal in stake_balances.items()
+            if bal is not None
+        ],
+        columns=["Bot", "Currency", "Free", "Total"],
+    )
+
+    per_currency = pd.concat(
+        [
+            trades.groupby("Currency").agg(
+                **{"# Trades": ("Stake", "size"), "In Trades": ("Stake", "sum")}
+            ),
+            balances.groupby("Currency")[["Free", "Total"]].sum(),
+            pd.concat([trades[["Bot", "Currency"]], balances[["Bot", "Currency"]]])
+            .groupby("Currency")["Bot"]
+            .nunique()
+            .rename("# Bots"),
+        ],
+        axis=1,
+    ).fillna(0)
+    total = per_currency["Total"].where(per_currency["Total"] > 0)
+    per_currency["Exposure %"] = (per_currency["In Trades"] / total * 100).fillna(0)
+    per_currency = per_currency.sort_values(by="In Trades", ascending=False)[
+        ["# Bots", "# Trades", "In Trades", "Free", "Total", "Exposure %"]
+    ]
+
+    per_pair = trades.groupby(["Pair", "Currency"]).agg(
+        **{"# Bots": ("Bot", "nunique"), "# Trades": ("Stake", "size"), "Stake": ("Stake", "sum")}
+    )
+    in_trades = per_currency["In Trades"].reindex(per_pair.index.get_level_values("Currency"))
+    per_pair["Share %"] = (
+        per_pair["Stake"].to_numpy() / in_trades.where(in_trades > 0).to_numpy() * 100
+    )
+    per_pair = per_pair.fillna(0).sort_values(by="Stake", ascending=False)
+
+    return per_currency.reset_index(names="Currency"), per_pair.reset_index()
@@ -0,0 +1,305 @@
+"""Builds the per-bot trade dataframes shown by the FTUI from a bot client"""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from ftui.ftui_client import API_DATE_FORMAT
+
+TZFMT = f"{API_DATE_FORMAT}%z"
+
+
+def open_trade_dataframe(ftuic) -> pd.DataFrame:
+    row_data = []
+
+    trades = ftuic.get_open_trades()
+    if trades is not None:
+        for t in trades:
+            otime = datetime.strptime(f"{t['open_date']}+00:00", TZFMT)
+            ctime = datetime.now(tz=timezone.utc)
+
+            open_orders = (
+                t["has_open_orders"]
+                if "has_open_orders" in t
+                else (t["open_order_id"] is not None)
+            )
+
+            num_orders = len(t["orders"]) if "orders" in t else 0
+
+            suff = ""
+            if open_orders and t["close_rate_requested"] is None:
+                suff = " *"
+
+            if t["close_rate_requested"] is not None:
+                suff = " **"
+
+            pairstr = f"{t['pair']}{suff}"
+            rpfta = round(float(t["profit_abs"]), 2)
+            t_dir = "S" if t["is_short"] else "L"
+            stop_profit = round(t['stop_loss_pct'], 2)
+
+            max_profit = 0
+
+            if num_orders == 1:
+                if t["max_rate"] is not None and t['max_rate'] != 0:
+                    max_profit = round(
+                        ((t["max_rate"] - t["open_rate"]) / t["max_rate"]) * 100, 2
+                    )
+            elif num_orders > 1:
+                max_profits = []
+                for o in t["orders"]:
+                    if t["max_rate"] is not None and t["max_rate"] != 0:
+                        max_profit_o = round(
+                            ((t["max_rate"] - o["safe_price"]) / o["safe_price"]) * 100, 2
+                        )
+                        max_profits.append(max_profit_o)
+                if max_profits:
+                    max_profit = round(sum(max_profits) / len(max_profits), 2)
+
+            row_data.append(
+                (
+                    ftuic.name,
+                    t["trade_id"],
+                    pairstr,
+                    t["open_rate"],
+                    t["current_rate"],
+                    stop_profit,
+                    max_profit,
+                    t["profit_pct"],
+                    rpfta,
+                    ctime - otime,
+                    t_dir,
+                    t["enter_tag"],
+                    t["open_date"],
+                    t["stake_amount"],
+                    t["leverage"],
+                    num_orders,
+                )
+            )
+
+    df = pd.DataFrame(
+        row_data,
+        columns=[
+            "Bot",
+            "ID",
+            "Pair",
+            "Open Rate",
+            "Current Rate",
+            "Stop %",
+            "Max %",
+            "Profit %",
+            "Profit",
+            "Dur.",
+            "S/L",
+            "Entry",
+            "Open Date",
+            "Stake Amount",
+            "Leverage",
+            "# Orders",
+        ],
+    )
+
+    df = df.sort_values(by="ID", ascending=False)
+
+    return df
+
+
+def closed_trade_dataframe(ftuic) -> pd.DataFrame:
+    row_data = []
+
+    trades = ftuic.get_all_closed_trades()
+    if trades is not None:
+        for t in trades:
+            row_data.append(
+                (
+                    ftuic.name,
+                    t.trade_id,
+                    t.pair,
+                    t.profit_pct,
+                    round(float(t.profit_abs), 2),
+                    t.open_date,
+                    t.close_date,
+                    t.close_date - t.open_date,
+                    t.enter_tag,
+                    t.exit_reason,
+                    t.open_rate,
+                    t.close_rate,
+                    t.stake_amount,
+                    t.leverage,
+                    "S" if t.is_short else "L",
+                )
+            )
+
+    df = pd.DataFrame(
+        row_data,
+        columns=[
+            "Bot",
+            "ID",
+            "Pair",
+            "Profit %",
+            "Profit",
+            "Open Date",
+            "Close Date",
+            "Dur.",
+            "Entry",
+            "Exit",
+            "Open Rate",
+            "Close Rate",
+            "Stake Amount",
+            "Leverage",
+            "S/L",
+        ],
+    )
+
+    return df
+
+
+def enter_tag_dataframe(ftuic) -> pd.DataFrame:
+    row_data = []
+
+    # get dict of bot to trades
+    trades_by_tag = {}
+
+    for at in ftuic.get_all_closed_trades():
+        if at.enter_tag not in trades_by_tag:
+            trades_by_tag[at.enter_tag] = []
+
+        trades_by_tag[at.enter_tag].append(at)
+
+    for tag, trades in trades_by_tag.items():
+        t_profit = 0.0
+
+        tot_trade_dur = 0
+        avg_win_trade_dur = 0
+        avg_loss_trade_dur = 0
+        win_trade_dur = 0
+        num_win = 0
+        loss_trade_dur = 0
+        num_loss = 0
+
+        for t in trades:
+            profit = float(t.profit_abs)
+            t_profit += profit
+            tdur = (t.close_date - t.open_date).total_seconds()
+            tot_trade_dur = tot_trade_dur + tdur
+
+            if profit > 0:
+                win_trade_dur = win_trade_dur + tdur
+                num_win = num_win + 1
+            else:
+                loss_trade_dur = loss_trade_dur + tdur
+                num_loss = num_loss + 1
+
+        t_profit = round(t_profit, 2)
+
+        avg_trade_dur = str(timedelta(seconds=round(tot_trade_dur / len(trades), 0)))
+
+        if num_win > 0:
+            avg_win_trade_dur = str(timedelta(seconds=round(win_trade_dur / num_win, 0)))
+        if num_loss > 0:
+            avg_loss_trade_dur = str(timedelta(seconds=round(loss_trade_dur / num_loss, 0)))
+
+        row_data.append(
+            (
+                tag,
+                num_win,
+                num_loss,
+                avg_trade_dur,
+                avg_win_trade_dur,
+                avg_loss_trade_dur,
+                t_profit,
+            )
+        )
+
+    df = pd.DataFrame(
+        row_data,
+        columns=[
+            "Tag",
+            "# Win",
+            "# Loss",
+            "Avg Dur.",
+            "Avg Win Dur.",
+            "Avg Loss Dur.",
+            "Profit",
+        ],
+    )
+
+    return df
+
+
+def performance_dataframe(ftuic) -> pd.DataFrame:
+    row_data = []
+
+    data = ftuic.get_performance()
+    if data is not None:
+        for t in data:
+            pairstr = t["pair"]
+            rpfta = round(float(t["profit_abs"]), 2)
+
+            row_data.append(
+                (
+                    pairstr,
+                    t["count"],
+                    t["profit_pct"],
+                    rpfta,
+                )
+            )
+
+    df = pd.DataFrame(row_data, columns=["Pair", "# Trades", "Avg Profit %", "Total Profit"])
+
+    return df
+
+
+def _period_profits(resp) -> tuple:
+    """Profit of the current and the previous period from a /daily, /weekly or /monthly"""
+    if resp is None or not resp.get("data"):
+        return float("nan"), float("nan")
+    data = resp["data"]
+    return data[0]["abs_profit"], data[1]["abs_profit"] if len(data) > 1 else 0.0
+
+
+def summary_dataframe(ftuic) -> pd.DataFrame:
+    """
+    One row of bot totals: the /profit figures, the open trade count and the
+    profit of the current and previous day, week and month. Empty while the
+    bot has never answered /profit.
+    """
+    profit = ftuic.get_total_profit()
+    if profit is None or "trade_count" not in profit:
+        return pd.DataFrame()
+
+    row = {k: v for k, v in profit.items() if not isinstance(v, (list, dict))}
+    row["open_trade_count"], row["max_open_trades"] = ftuic.get_open_trade_count()
+    row["daily_profit"], row["yesterday_profit"] = _period_profits(ftuic.get_daily_profit(days=2))
+    row["weekly_profit"], row["last_week_profit"] = _period_profits(
+        ftuic.get_weekly_profit(weeks=2)
+    )
+    row["monthly_profit"], row["last_month_profit"] = _period_profits(
+        ftuic.get_monthly_profit(months=2)
+    )
+
+    return pd.DataFrame([row])
+
+
+def balance_dataframe(ftuic) -> pd.DataFrame:
+    """
+    The stake currency entry of /balance as one row, so the balance travels
+    like any other frame. Empty while the bot has never answered /balance.
+    """
+    ftuic.get_balance()
+    bal = ftuic.stake_balance()
+    if bal is None:
+        return pd.DataFrame()
+
+    return pd.DataFrame([{k: v for k, v in bal.items() if not isinstance(v, (list, dict))}])
+
+
+# builder of each dataframe kept in FreqText.client_dfs
+FRAME_BUILDERS = {
+    "op_data": open_trade_dataframe,
+    "cl_data": closed_trade_dataframe,
+    "tag_data": enter_tag_dataframe,
+    "perf_data": performance_dataframe,
+    "summary_data": summary_dataframe,
+    "balance": balance_dataframe,
+}
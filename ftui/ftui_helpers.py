@@ -1,6 +1,11 @@
-from datetime import datetime
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import time
 
 import pandas as pd
+import rapidjson
 import requests
 from rich import box
 from rich.table import Table
@@ -69,18 +74,20 @@ def set_red_green_widget_colour(w, val):
         w.styles.color = "green"
 
 
-def _get_dataframe_data_from_client(client, client_dfs, data_type):
+def _get_dataframe_data_from_client(client, client_dfs, data_type, copy=True):
     if client.name in client_dfs and data_type in client_dfs[client.name]:
-        return client_dfs[client.name][data_type].copy()
+        df = client_dfs[client.name][data_type]
+        # frames are replaced, never modified, on refresh so read-only callers can share them
+        return df.copy() if copy else df
     return pd.DataFrame()
 
 
-def get_open_dataframe_data(client, client_dfs):
-    return _get_dataframe_data_from_client(client, client_dfs, "op_data")
+def get_open_dataframe_data(client, client_dfs, copy=True):
+    return _get_dataframe_data_from_client(client, client_dfs, "op_data", copy=copy)
 
 
-def get_closed_dataframe_data(client, client_dfs):
-    return _get_dataframe_data_from_client(client, client_dfs, "cl_data")
+def get_closed_dataframe_data(client, client_dfs, copy=True):
+    return _get_dataframe_data_from_client(client, client_dfs, "cl_data", copy=copy)
 
 
 def get_tag_dataframe_data(client, client_dfs):
@@ -91,6 +98,22 @@ def get_perf_dataframe_data(client, client_dfs):
     return _get_dataframe_data_from_client(client, client_dfs, "perf_data")
 
 
+def get_summary_data(client, client_dfs):
+    """The bot totals row of ftui_frames.summary_dataframe as a dict, None if not fetched yet"""
+    df = _get_dataframe_data_from_client(client, client_dfs, "summary_data", copy=False)
+    if df.empty:
+        return None
+    return df.iloc[0].to_dict()
+
+
+def get_balance_data(client, client_dfs):
+    """The stake currency /balance entry of ftui_frames.balance_dataframe, None if not fetched"""
+    df = _get_dataframe_data_from_client(client, client_dfs, "balance", copy=False)
+    if df.empty:
+        return None
+    return df.iloc[0].to_dict()
+
+
 def daily_profit_table(client_dict, num_days_daily) -> Table:
     table = Table(expand=True, box=box.HORIZONTALS)
 
@@ -103,15 +126,23 @@ def daily_profit_table(client_dict, num_days_daily) -> Table:
         table.add_column(f"{n}", style="yellow", justify="right")
         table.add_column("#", style="cyan", justify="left")
 
+    # fetch all bots at once rather than one after another
+    with ThreadPoolExecutor(max_workers=max(min(len(client_dict), 16), 1)) as executor:
+        dailies = list(
+            executor.map(lambda cl: cl.rest_client.daily(days=num_days_daily), client_dict.values())
+        )
+
     dailydict = {}
 
-    for n, cl in client_dict.items():
-        t = cl.rest_client.daily(days=num_days_daily)
+    for t in dailies:
+        if t is None or "data" not in t:
+            continue
+
         for day in t["data"]:
             if day["date"] not in dailydict.keys():
                 dailydict[day["date"]] = [
                     day["date"],
-                    f"{fear[day['date']]}",
+                    f"{fear.get(day['date'], '-')}",
                     f"{round(float(day['abs_profit']),2)} {t['stake_currency']}",
                     f"{day['trade_count']}",
                 ]
@@ -128,52 +159,111 @@ def daily_profit_table(client_dict, num_days_daily) -> Table:
 
 
 # thanks @rextea!
-def fear_index(num_days_daily, retfear={}):
-    default_resp = {
-        "name": "Fear and Greed Index",
-        "data": [
-            {
-                "value": "3",
-                "value_classification": "Neutral",
-                "timestamp": str(datetime.today()),
-            }
-        ],
+class FearIndexProvider:
+    """
+    Fear and Greed index from alternative.me, cached on disk.
+
+    Lookups never touch the network: they return whatever is cached and, once
+    the cache has expired (the index updates daily), start a background
+    refresh. If the API can't be reached the cached values keep being served.
+    """
+
+    URL = "https://api.alternative.me/fng/?limit={limit}&date_format=kr"
+
+    COLOURMAP = {
+        "Extreme Fear": "[red]",
+        "Fear": "[lightred]",
+        "Neutral": "[yellow]",
+        "Greed": "[lightgreen]",
+        "Extreme Greed": "[green]",
     }
 
-    if not retfear:
-        resp = requests.get(
-            f"https://api.alternative.me/fng/?limit={num_days_daily}&date_format=kr"
-        )
-    else:
-        if str(datetime.today()) in retfear:
-            return retfear[str(datetime.today())]
+    def __init__(self, cache_path=None, timeout=5):
+        if cache_path is None:
+            cache_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+            cache_path = cache_dir / "ftui" / "fear_index.json"
+
+        self.cache_path = Path(cache_path)
+        self.timeout = timeout
+
+        self.values = {}
+        self.limit = 0
+        self.expires = 0
+
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        self._load_cache()
+
+    def _load_cache(self):
+        try:
+            cache = rapidjson.loads(self.cache_path.read_text())
+            self.values = cache["values"]
+            self.limit = cache["limit"]
+            self.expires = cache["expires"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save_cache(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(
+                rapidjson.dumps(
+                    {"values": self.values, "limit": self.limit, "expires": self.expires}
+                )
+            )
+        except OSError:
+            pass
+
+    def get(self, num_days) -> dict:
+        """Colour-formatted classification per date, from the cache"""
+        if time() >= self.expires or num_days > self.limit:
+            self.refresh(num_days)
+
+        return {
+            date: f"{self.COLOURMAP.get(value, '')}{value}" for date, value in self.values.items()
+        }
+
+    def refresh(self, num_days, background=True):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        if background:
+            threading.Thread(target=self._refresh, args=(num_days,), daemon=True).start()
         else:
-            resp = requests.get("https://api.alternative.me/fng/?limit=1&date_format=kr")
+            self._refresh(num_days)
 
-    if resp is not None and resp.headers.get("Content-Type").startswith("application/json"):
+    def _refresh(self, num_days):
         try:
-            prev_resp = resp.json()
-            df_gf = prev_resp["data"]
+            limit = max(num_days, self.limit)
+            resp = requests.get(self.URL.format(limit=limit), timeout=self.timeout)
+            data = resp.json()["data"]
+
+            self.values = {i["timestamp"]: i["value_classification"] for i in data}
+            self.limit = limit
+
+            # the index is updated once a day, the API tells us when
+            next_update = data[0].get("time_until_update") if data else None
+            if next_update is not None:
+                self.expires = time() + int(next_update)
+            else:
+                self.expires = time() + 3600
+
+            self._save_cache()
         except Exception:
-            prev_resp = default_resp
-            df_gf = prev_resp["data"]
-    else:
-        prev_resp = default_resp
-        df_gf = prev_resp["data"]
-
-    colourmap = {}
-    colourmap["Extreme Fear"] = "[red]"
-    colourmap["Fear"] = "[lightred]"
-    colourmap["Neutral"] = "[yellow]"
-    colourmap["Greed"] = "[lightgreen]"
-    colourmap["Extreme Greed"] = "[green]"
-
-    for i in df_gf:
-        retfear[i["timestamp"]] = (
-            f"{colourmap[i['value_classification']]}{i['value_classification']}"
-        )
+            # offline: keep serving the cache, try again in a while
+            self.expires = time() + 600
+        finally:
+            self._refreshing = False
+
+
+fear_index_provider = FearIndexProvider()
 
-    return retfear
+
+def fear_index(num_days_daily):
+    return fear_index_provider.get(num_days_daily)
 
 
 def dash_trades_summary(
@@ -255,25 +345,79 @@ def dash_closed_trades_table(row_data, colours=FtuiColours()) -> Table:
     return table
 
 
-def dash_cumulative_profit_plot_data(trades, bot_list=[], pair=None):
-    if trades.shape[0] > 0 and bot_list:
-        # Filter trades to what's in the bot_list
-        trades = trades.loc[trades['Bot'].apply(lambda x: x in bot_list)].copy()
+def dash_pair_performance_table(row_data, colours=FtuiColours()) -> Table:
+    table = Table(expand=True, box=box.HORIZONTALS)
 
-        # Filter trades to one pair
-        if pair is not None:
-            trades = trades.loc[trades["Pair"] == pair].copy()
+    # ("Pair", "# Bots", "# Trades", "Avg Profit %", "Total Profit"),
+    table.add_column("Pair", style=colours.pair_col, no_wrap=True)
+    table.add_column("# Bots", style=colours.bot_col, no_wrap=True)
+    table.add_column("# Trades", style="white", no_wrap=True)
+    table.add_column("Avg Profit %", justify="right")
+    table.add_column("Total Profit", justify="right")
 
-    if trades.shape[0] > 0 and "Open Date" in trades.columns:
-        s = trades.resample("D", on="Open Date")["Profit"].sum()
-    
-        data = pd.DataFrame(index=s.index, data={"binned": s.values})
-        data["plot_cumprof"] = data["binned"].cumsum().round(2)
-        data["plot_cumprof"].ffill(inplace=True)
-    else:
-        data = pd.DataFrame()
+    for row in row_data:
+        table.add_row(*row)
+
+    return table
+
+
+def dash_exposure_table(row_data, colours=FtuiColours()) -> Table:
+    table = Table(expand=True, box=box.HORIZONTALS)
+
+    # ("Currency", "# Bots", "# Trades", "In Trades", "Free", "Total", "Exposure %"),
+    table.add_column("Currency", style="white", no_wrap=True)
+    table.add_column("# Bots", style=colours.bot_col, no_wrap=True)
+    table.add_column("# Trades", style=colours.open_trade_num_col, no_wrap=True)
+    table.add_column("In Trades", justify="right")
+    table.add_column("Free", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Exposure %", justify="right")
+
+    for row in row_data:
+        table.add_row(*row)
+
+    return table
 
-    return data
+
+def dash_drawdown_table(row_data, footer, colours=FtuiColours()) -> Table:
+    table = Table(expand=True, box=box.HORIZONTALS, show_footer=True)
+
+    # ("Bot", "# Trades", "Profit", "Max DD", "DD", "Underwater", "Max Underwater",
+    #  "# Recoveries", "Avg Recovery", "Max Recovery"),
+    table.add_column("Bot", style=colours.bot_col, no_wrap=True, footer="All")
+    table.add_column("# Trades", style=colours.closed_trade_num_col, no_wrap=True)
+    table.add_column("Profit", justify="right")
+    table.add_column("Max DD", justify="right")
+    table.add_column("DD", justify="right")
+    table.add_column("Underwater", justify="right")
+    table.add_column("Max Underwater", justify="right")
+    table.add_column("# Recoveries", justify="right")
+    table.add_column("Avg Recovery", justify="right")
+    table.add_column("Max Recovery", justify="right")
+
+    for column, value in zip(table.columns[1:], footer):
+        column.footer = value
+
+    for row in row_data:
+        table.add_row(*row)
+
+    return table
+
+
+def dash_pair_exposure_table(row_data, colours=FtuiColours()) -> Table:
+    table = Table(expand=True, box=box.HORIZONTALS)
+
+    # ("Pair", "# Bots", "# Trades", "Stake", "Share %"),
+    table.add_column("Pair", style=colours.pair_col, no_wrap=True)
+    table.add_column("# Bots", style=colours.bot_col, no_wrap=True)
+    table.add_column("# Trades", style=colours.open_trade_num_col, no_wrap=True)
+    table.add_column("Stake", justify="right")
+    table.add_column("Share %", justify="right")
+
+    for row in row_data:
+        table.add_row(*row)
+
+    return table
 
 
 def bot_trades_summary_table(row_data, colours=FtuiColours()) -> Table:
@@ -407,7 +551,7 @@ def bot_general_metrics_table(client) -> str:
     config = client.get_client_config()
 
     t = client.get_total_profit()
-    if t is None:
+    if t is None or "trade_count" not in t:
         return "[ERROR] Could not retrieve profit data."
 
     trade_count = t["trade_count"]
@@ -455,6 +599,61 @@ def bot_general_metrics_table(client) -> str:
     return table
 
 
+def format_bytes(num) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(num) < 1024:
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+    return f"{num:.1f} GB"
+
+
+def bot_memory_table(report) -> Table:
+    table = Table(expand=True, box=box.HORIZONTALS, row_styles=["grey89", ""])
+    table.add_column("FTUI Memory", style="bold white", no_wrap=True, ratio=1)
+    table.add_column("Trades", style="white", justify="right", ratio=1)
+    table.add_column("Size", style="white", justify="right", ratio=1)
+
+    compact, raw = report["compact_bytes"], report["raw_bytes"]
+    saving = f"{(1 - compact / raw) * 100:.0f}%" if raw else "-"
+
+    row_data = [
+        ("Closed trade history", f"{report['closed_trades']}", format_bytes(compact)),
+        ("  as API dicts (est.)", f"{report['closed_trades']}", format_bytes(raw)),
+        ("  saving", "", saving),
+        ("Closed trades pages", f"{report['paged_trades']}", format_bytes(report["paged_bytes"])),
+        (
+            "Trade details",
+            f"{report['trade_details']}",
+            format_bytes(report["trade_details_bytes"]),
+        ),
+    ]
+
+    for row in row_data:
+        table.add_row(*row)
+
+    return table
+
+
+def alert_stats_table(stats) -> Table:
+    table = Table(expand=True, box=box.HORIZONTALS, row_styles=["grey89", ""])
+    table.add_column("FTUI Alert Rules", style="bold white", no_wrap=True, ratio=1)
+    table.add_column("", style="white", justify="right", ratio=1)
+
+    row_data = [
+        ("Rules", f"{stats['rules']}"),
+        ("Evaluations", f"{stats['evaluations']}"),
+        ("Mean evaluation time", f"{stats['mean_time'] * 1e6:.0f} µs"),
+        ("Max evaluation time", f"{stats['max_time'] * 1e6:.0f} µs"),
+        ("Alerts fired", f"{stats['fired']}"),
+        ("Alerting now", f"{stats['active']}"),
+    ]
+
+    for row in row_data:
+        table.add_row(*row)
+
+    return table
+
+
 def bot_config(client) -> str:
     config = client.get_client_config()
 
@@ -0,0 +1,698 @@
+"""Incrementally maintained time series for the FTUI charts"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def _cache_get(cache: OrderedDict, key):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _cache_put(cache: OrderedDict, key, value, max_size):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > max_size:
+        cache.popitem(last=False)
+
+
+def _to_days(dates) -> np.ndarray:
+    return np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+
+
+def _days_to_index(start, end) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(np.arange(start, end).astype("datetime64[D]"))
+
+
+def lttb_indices(y, threshold) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    Points are assumed evenly spaced on x, which holds for the daily series
+    plotted here. The first and last points are always kept.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+
+        # average of the next bucket is the third triangle vertex
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        avg_x = (next_lo + next_hi - 1) / 2
+        avg_y = y[next_lo:next_hi].mean()
+
+        xs = np.arange(lo, hi)
+        areas = np.abs((a - avg_x) * (y[lo:hi] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = lo + int(areas.argmax())
+        kept[i + 1] = a
+
+    return kept
+
+
+# unit -> (pandas frequency, seconds); months are taken as 30 days where a length is needed
+TIMEFRAME_UNITS = {
+    "s": ("s", 1),
+    "m": ("min", 60),
+    "h": ("h", 3600),
+    "d": ("D", 86400),
+    "w": ("W-MON", 604800),
+    "M": ("MS", 2592000),
+}
+
+
+def timeframe_to_seconds(timeframe) -> int:
+    return int(timeframe[:-1]) * TIMEFRAME_UNITS[timeframe[-1]][1]
+
+
+def timeframe_to_minutes(timeframe) -> float:
+    return timeframe_to_seconds(timeframe) / 60
+
+
+def higher_timeframes(timeframe, candidates=("5m", "15m", "30m", "1h", "4h", "1d", "1w")) -> list:
+    """Candidate timeframes that can be built from whole candles of `timeframe`"""
+    if timeframe[-1] not in TIMEFRAME_UNITS:
+        return []
+
+    base = timeframe_to_seconds(timeframe)
+    return [
+        tf
+        for tf in candidates
+        if timeframe_to_seconds(tf) > base and timeframe_to_seconds(tf) % base == 0
+    ]
+
+
+class ResampledCandles:
+    """
+    Higher timeframe candles built from cached base timeframe candles.
+
+    On update only the base candles from the start of the last (possibly
+    partial) bucket onwards are resampled, replacing that bucket and
+    appending any new ones.
+    """
+
+    def __init__(self, timeframe):
+        unit, _ = TIMEFRAME_UNITS[timeframe[-1]]
+        self.freq = f"{timeframe[:-1]}{unit}"
+        self.period = pd.Timedelta(seconds=timeframe_to_seconds(timeframe))
+        self.data = None
+        self.base_last_date = None
+
+    def _resample(self, base, dates) -> pd.DataFrame:
+        df = base.drop(columns=["date"]).set_index(pd.DatetimeIndex(dates))
+
+        agg = {col: "last" for col in df.columns}
+        agg.update({"Open": "first", "High": "max", "Low": "min", "Close": "last"})
+        if "volume" in agg:
+            agg["volume"] = "sum"
+
+        out = df.resample(self.freq, label="left", closed="left").agg(agg)
+        out = out.dropna(subset=["Open"])
+        out.index.name = "date"
+        return out.reset_index()
+
+    def update(self, base: pd.DataFrame) -> pd.DataFrame:
+        if base is None or base.empty:
+            return pd.DataFrame()
+
+        dates = pd.to_datetime(base["date"], utc=True)
+        last_date = dates.iloc[-1]
+
+        if self.data is None or self.data.empty:
+            self.data = self._resample(base, dates)
+        elif last_date != self.base_last_date:
+            bucket_start = self.data["date"].iloc[-1]
+            mask = (dates >= bucket_start).to_numpy()
+            tail = self._resample(base.loc[mask], dates[mask])
+
+            head = self.data.iloc[:-1]
+            # drop buckets that have fallen out of the base window
+            head = head.loc[head["date"] > dates.iloc[0] - self.period]
+            self.data = pd.concat([head, tail], ignore_index=True)
+
+        self.base_last_date = last_date
+        return self.data
+
+
+def aggregate_ohlc(data: pd.DataFrame, max_candles) -> pd.DataFrame:
+    """
+    Merge consecutive candles so that at most `max_candles` remain.
+
+    Buckets take the first date and open, the highest high, the lowest low
+    and the last close; any other (indicator) column takes its last value.
+    Buckets are counted back from the most recent candle, so only the oldest
+    bucket can be short.
+    """
+    n = len(data)
+    if max_candles <= 0 or n <= max_candles:
+        return data
+
+    size = -(-n // max_candles)
+    starts = np.arange(n - size, -1, -size)[::-1]
+    if starts[0] != 0:
+        starts = np.concatenate(([0], starts))
+
+    ends = np.append(starts[1:], n) - 1
+    out = {
+        "date": data["date"].to_numpy()[starts],
+        "Open": data["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(data["High"].to_numpy(), starts),
+        "Low": np.minimum.reduceat(data["Low"].to_numpy(), starts),
+        "Close": data["Close"].to_numpy()[ends],
+    }
+    for col in data.columns.difference(list(out), sort=False):
+        out[col] = data[col].to_numpy()[ends]
+
+    return pd.DataFrame(out)
+
+
+class DailyProfitBins:
+    """
+    Closed trade profit of one bot, binned by trade open day.
+
+    Only trades not seen before are added on update, and every update that
+    changes the bins records the first day it touched so consumers can
+    recompute from that day onwards only.
+    """
+
+    MAX_CHANGES = 100
+
+    def __init__(self):
+        self.start = None
+        self.values = np.zeros(0)
+        self.known_ids = np.zeros(0, dtype=np.int64)
+        self.version = 0
+        self.changes = []
+
+    @property
+    def end(self):
+        return self.start + len(self.values)
+
+    def reset(self):
+        version = self.version
+        self.__init__()
+
+        # versions keep increasing, consumers of an older one rebuild from the start
+        self.version = version + 1
+        self.changes = [(self.version, -np.inf)]
+
+    def update(self, trades: pd.DataFrame) -> bool:
+        if trades is None or trades.empty or "Open Date" not in trades.columns:
+            return False
+
+        ids = trades["ID"].to_numpy(dtype=np.int64)
+
+        # trades were deleted on the bot, start over
+        if len(ids) < len(self.known_ids):
+            self.reset()
+
+        new_mask = ~np.isin(ids, self.known_ids, assume_unique=True)
+        if not new_mask.any():
+            return False
+
+        days = _to_days(trades["Open Date"].to_numpy()[new_mask])
+        profits = trades["Profit"].to_numpy(dtype=float)[new_mask]
+        lo = int(days.min())
+        hi = int(days.max()) + 1
+
+        if self.start is None:
+            self.start = lo
+            self.values = np.zeros(hi - lo)
+        elif lo < self.start or hi > self.end:
+            new_start = min(lo, self.start)
+            values = np.zeros(max(hi, self.end) - new_start)
+            values[self.start - new_start : self.end - new_start] = self.values
+            self.start = new_start
+            self.values = values
+
+        np.add.at(self.values, days - self.start, profits)
+        self.known_ids = np.union1d(self.known_ids, ids[new_mask])
+
+        self.version += 1
+        self.changes.append((self.version, lo))
+        del self.changes[: -self.MAX_CHANGES]
+
+        return True
+
+    def changed_since(self, version):
+        """First day changed after `version`, None if unchanged, or -inf if unknown"""
+        if version == self.version:
+            return None
+        if not self.changes or self.changes[0][0] > version + 1:
+            return -np.inf
+
+        return min((day for v, day in self.changes if v > version), default=-np.inf)
+
+
+class FleetProfitSeries:
+    """
+    Per-bot DailyProfitBins with cached cumulative curves per bot subset.
+
+    The curve for a subset is the vector sum of its bots' bins; when a bot
+    gains new trades only the tail from the first changed day is re-summed.
+    """
+
+    # curves kept for the most recently drawn bot subsets (and widths)
+    MAX_CACHED_CURVES = 8
+
+    def __init__(self):
+        self.bins = {}
+        self._cache = OrderedDict()
+        self._downsampled = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, bot, trades: pd.DataFrame) -> bool:
+        with self._lock:
+            if bot not in self.bins:
+                self.bins[bot] = DailyProfitBins()
+            return self.bins[bot].update(trades)
+
+    def cumulative_profit(self, bot_list, width=None) -> pd.DataFrame:
+        """
+        Daily binned and cumulative profit of the given bots.
+
+        With `width`, the curve is reduced to about that many points with LTTB,
+        cached per (bots, width) until the underlying curve changes.
+        """
+        data = self._cumulative_profit(bot_list)
+        if width is None or len(data) <= width:
+            return data
+
+        key = (frozenset(bot_list), width)
+        with self._lock:
+            cached = _cache_get(self._downsampled, key)
+            if cached is not None and cached[0] is data:
+                return cached[1]
+
+        sampled = data.iloc[lttb_indices(data["plot_cumprof"].to_numpy(), width)]
+
+        with self._lock:
+            _cache_put(self._downsampled, key, (data, sampled), self.MAX_CACHED_CURVES)
+        return sampled
+
+    def _cumulative_profit(self, bot_list) -> pd.DataFrame:
+        with self._lock:
+            key = frozenset(bot_list)
+            bots = {
+                name: b for name, b in self.bins.items() if name in key and b.start is not None
+            }
+            if not bots:
+                return pd.DataFrame()
+
+            start = min(b.start for b in bots.values())
+            end = max(b.end for b in bots.values())
+            versions = {name: b.version for name, b in bots.items()}
+
+            changed_from = start
+            cached = _cache_get(self._cache, key)
+            if cached is not None and cached["start"] == start and cached["bots"] == set(bots):
+                changes = [
+                    b.changed_since(cached["versions"][name]) for name, b in bots.items()
+                ]
+                changes = [c for c in changes if c is not None]
+
+                if not changes and cached["end"] == end:
+                    return cached["data"]
+
+                changed_from = max(min(changes, default=cached["end"]), start)
+                changed_from = min(changed_from, cached["end"])
+
+            binned = np.zeros(end - start)
+            for b in bots.values():
+                binned[b.start - start : b.end - start] += b.values
+
+            k = int(changed_from - start)
+            cumprof = np.empty(end - start)
+            if k > 0:
+                cumprof[:k] = cached["cumprof"][:k]
+                cumprof[k:] = cumprof[k - 1] + np.cumsum(binned[k:])
+            else:
+                cumprof[:] = np.cumsum(binned)
+
+            data = pd.DataFrame(
+                index=_days_to_index(start, end),
+                data={"binned": binned, "plot_cumprof": cumprof.round(2)},
+            )
+
+            _cache_put(
+                self._cache,
+                key,
+                {
+                    "start": start,
+                    "end": end,
+                    "bots": frozenset(bots),
+                    "versions": versions,
+                    "cumprof": cumprof,
+                    "data": data,
+                },
+                self.MAX_CACHED_CURVES,
+            )
+
+            return data
+
+
+class RingSeries:
+    """
+    Fixed size time series, one value per `resolution` seconds.
+
+    Samples falling in the same bucket as the last one replace it, so the
+    buffer holds the last value of each of the `capacity` latest buckets.
+    """
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros(capacity, dtype=np.float32)
+        self.head = 0
+        self.count = 0
+        self.last_bucket = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.values.nbytes
+
+    def append(self, t, value):
+        bucket = int(t) // self.resolution
+        if bucket != self.last_bucket:
+            self.head = (self.head + 1) % len(self.times)
+            self.count = min(self.count + 1, len(self.times))
+            self.last_bucket = bucket
+
+        self.times[self.head] = int(t)
+        self.values[self.head] = value
+
+    def data(self) -> tuple:
+        """Times and values, oldest first"""
+        idx = (np.arange(self.head - self.count + 1, self.head + 1)) % len(self.times)
+        return self.times[idx], self.values[idx]
+
+
+class OpenProfitHistory:
+    """
+    Unrealized profit of each bot and of the fleet over time.
+
+    Every sample goes to a few RingSeries of increasing resolution, so that
+    recent history is kept at full refresh rate and older history at
+    coarser steps, in a fixed amount of memory per bot.
+    """
+
+    # (seconds per point, points): 1 hour at 5s, 12 hours at 1 min, 7 days at 15 min
+    TIERS = ((5, 720), (60, 720), (900, 672))
+
+    FLEET = None
+
+    # a bot's last open profit counts towards the fleet total for this long (seconds)
+    MAX_AGE = 60
+
+    def __init__(self, tiers=TIERS, max_age=MAX_AGE):
+        self.tiers = tiers
+        self.max_age = max_age
+        self.series = {}
+        # bot -> (time, open profit) of its last good update
+        self.latest = {}
+        self._lock = threading.Lock()
+
+    def _append(self, key, t, value):
+        if key not in self.series:
+            self.series[key] = [RingSeries(res, cap) for res, cap in self.tiers]
+        for ring in self.series[key]:
+            ring.append(t, value)
+
+    def update(self, bot, t, open_profit):
+        """
+        Record a bot's open profit at time t (epoch seconds), and the fleet
+        total over the bots updated in the last max_age seconds
+        """
+        with self._lock:
+            self.latest[bot] = (t, open_profit)
+            self._append(bot, t, open_profit)
+            self._append(
+                self.FLEET,
+                t,
+                sum(value for since, value in self.latest.values() if t - since <= self.max_age),
+            )
+
+    def drop(self, bot):
+        """Leave a bot that failed to update out of the fleet total until it updates again"""
+        with self._lock:
+            self.latest.pop(bot, None)
+
+    def _history(self, key) -> pd.Series:
+        # finest tier first, coarser tiers only for the time before it starts
+        parts = []
+        until = None
+        for ring in self.series.get(key, []):
+            times, values = ring.data()
+            if until is not None:
+                keep = times < until
+                times, values = times[keep], values[keep]
+            if len(times):
+                parts.append((times, values))
+                until = times[0]
+
+        if not parts:
+            return pd.Series(dtype=float)
+
+        times = np.concatenate([p[0] for p in reversed(parts)])
+        values = np.concatenate([p[1] for p in reversed(parts)])
+        return pd.Series(values.astype(float), index=pd.to_datetime(times, unit="s", utc=True))
+
+    def history(self, bot_list=None) -> pd.Series:
+        """Open profit over time of the given bots, or of the whole fleet"""
+        with self._lock:
+            if bot_list is None or set(bot_list) >= set(self.series) - {self.FLEET}:
+                return self._history(self.FLEET)
+
+            curves = [self._history(bot) for bot in bot_list if bot in self.series]
+            if not curves:
+                return pd.Series(dtype=float)
+
+            # align the bots on their sample times, each holding its last value
+            df = pd.concat(curves, axis=1).sort_index().ffill().fillna(0)
+            return df.sum(axis=1)
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(ring.nbytes for rings in self.series.values() for ring in rings)
+
+
+def _close_times(trades: pd.DataFrame) -> np.ndarray:
+    # closed trade dates are naive UTC
+    return trades["Close Date"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+
+def drawdown_stats(times, equity, peak, now=None) -> dict:
+    """
+    Drawdown figures of an equity curve with its running peak.
+
+    The curve is taken to start at 0 just before its first point. Times are
+    epoch nanoseconds, durations are returned as pd.Timedelta.
+    """
+    if now is None:
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None).value
+
+    stats = {
+        "trades": len(equity),
+        "profit": 0.0,
+        "max_drawdown": 0.0,
+        "drawdown": 0.0,
+        "underwater": pd.Timedelta(0),
+        "max_underwater": pd.Timedelta(0),
+        "recoveries": 0,
+        "mean_recovery": None,
+        "max_recovery": None,
+    }
+    if not len(equity):
+        return stats
+
+    times = np.concatenate(([times[0]], times))
+    equity = np.concatenate(([0.0], equity))
+    peak = np.concatenate(([0.0], peak))
+
+    drawdown = peak - equity
+    at_peak = np.flatnonzero(drawdown <= 0)
+
+    # a stretch between two peaks with points below them is a recovered drawdown
+    recovered = np.diff(at_peak) > 1
+    recoveries = times[at_peak[1:][recovered]] - times[at_peak[:-1][recovered]]
+
+    underwater = now - times[at_peak[-1]] if drawdown[-1] > 0 else 0
+    max_underwater = max(recoveries.max(initial=0), underwater)
+
+    stats.update(
+        profit=float(equity[-1]),
+        max_drawdown=float(drawdown.max()),
+        drawdown=float(drawdown[-1]),
+        underwater=pd.Timedelta(int(underwater)),
+        max_underwater=pd.Timedelta(int(max_underwater)),
+        recoveries=len(recoveries),
+    )
+    if len(recoveries):
+        stats["mean_recovery"] = pd.Timedelta(int(recoveries.mean()))
+        stats["max_recovery"] = pd.Timedelta(int(recoveries.max()))
+
+    return stats
+
+
+class EquityCurve:
+    """
+    Closed trade equity curve of one bot, in close date order.
+
+    Trades closing after the last known one are appended, continuing the
+    cumulative profit and running peak from where they were. A trade closing
+    earlier than that, or trades disappearing, rebuilds the curve.
+    """
+
+    def __init__(self):
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.times = np.zeros(0, dtype=np.int64)
+        self.profits = np.zeros(0)
+        self.equity = np.zeros(0)
+        self.peak = np.zeros(0)
+        # bumped whenever the curve is rebuilt rather than appended to
+        self.rebuilds = 0
+
+    def _set(self, ids, times, profits):
+        self.rebuilds += 1
+        order = np.argsort(times, kind="stable")
+        self.ids = ids[order]
+        self.times = times[order]
+        self.profits = profits[order]
+        self.equity = np.cumsum(self.profits)
+        self.peak = np.maximum.accumulate(np.maximum(self.equity, 0))
+
+    def _append(self, ids, times, profits):
+        order = np.argsort(times, kind="stable")
+        ids, times, profits = ids[order], times[order], profits[order]
+
+        last_equity = self.equity[-1] if len(self.equity) else 0.0
+        last_peak = self.peak[-1] if len(self.peak) else 0.0
+        equity = last_equity + np.cumsum(profits)
+        peak = np.maximum.accumulate(np.maximum(equity, last_peak))
+
+        self.ids = np.concatenate((self.ids, ids))
+        self.times = np.concatenate((self.times, times))
+        self.profits = np.concatenate((self.profits, profits))
+        self.equity = np.concatenate((self.equity, equity))
+        self.peak = np.concatenate((self.peak, peak))
+
+    def update(self, trades: pd.DataFrame) -> bool:
+        if trades is None or trades.empty or "Close Date" not in trades.columns:
+            return False
+
+        ids = trades["ID"].to_numpy(dtype=np.int64)
+        new_mask = ~np.isin(ids, self.ids)
+        if not new_mask.any() and len(ids) == len(self.ids):
+            return False
+
+        times = _close_times(trades)
+        profits = trades["Profit"].to_numpy(dtype=float)
+
+        if len(ids) - new_mask.sum() < len(self.ids) or (
+            len(self.times) and times[new_mask].min() < self.times[-1]
+        ):
+            self._set(ids, times, profits)
+        else:
+            self._append(ids[new_mask], times[new_mask], profits[new_mask])
+
+        return True
+
+    def stats(self, now=None) -> dict:
+        return drawdown_stats(self.times, self.equity, self.peak, now)
+
+
+class FleetEquity:
+    """
+    Per-bot EquityCurves and the curves of bot subsets built from them.
+
+    A subset curve merges its bots' trades in close date order. While its
+    bots' curves have only been appended to, and with trades closing after
+    the subset's last one, the new trades are appended to the subset curve
+    instead of merging everything again.
+    """
+
+    # subset curves kept for the most recently drawn bot subsets
+    MAX_CACHED_CURVES = 8
+
+    def __init__(self):
+        self.curves = {}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, bot, trades: pd.DataFrame) -> bool:
+        with self._lock:
+            if bot not in self.curves:
+                self.curves[bot] = EquityCurve()
+            return self.curves[bot].update(trades)
+
+    def _subset_curve(self, key) -> EquityCurve:
+        bots = {name: c for name, c in self.curves.items() if name in key}
+        state = {name: (c.rebuilds, len(c.ids)) for name, c in bots.items()}
+
+        cached = _cache_get(self._cache, key)
+        if cached is not None and cached["state"] == state:
+            return cached["curve"]
+
+        curve = None
+        if cached is not None and cached["state"].keys() == state.keys():
+            prev = cached["state"]
+            if all(state[name][0] == prev[name][0] for name in bots):
+                tails = [(c, prev[name][1]) for name, c in bots.items()]
+                times = np.concatenate([c.times[n:] for c, n in tails])
+                curve = cached["curve"]
+                if len(curve.times) and times.min() < curve.times[-1]:
+                    curve = None
+                else:
+                    curve._append(
+                        np.concatenate([c.ids[n:] for c, n in tails]),
+                        times,
+                        np.concatenate([c.profits[n:] for c, n in tails]),
+                    )
+
+        if curve is None:
+            curve = EquityCurve()
+            if bots:
+                curve._set(
+                    np.concatenate([c.ids for c in bots.values()]),
+                    np.concatenate([c.times for c in bots.values()]),
+                    np.concatenate([c.profits for c in bots.values()]),
+                )
+
+        _cache_put(self._cache, key, {"state": state, "curve": curve}, self.MAX_CACHED_CURVES)
+        return curve
+
+    def curve(self, bot_list) -> pd.DataFrame:
+        """Equity and drawdown of the given bots together, indexed by close date"""
+        with self._lock:
+            c = self._subset_curve(frozenset(bot_list))
+            return pd.DataFrame(
+                {"equity": c.equity, "drawdown": c.equity - c.peak},
+                index=pd.to_datetime(c.times),
+            )
+
+    def stats(self, bot_list, now=None) -> tuple:
+        """Drawdown figures of each of the given bots, and of all of them together"""
+        with self._lock:
+            bot_stats = {
+                bot: self.curves[bot].stats(now) for bot in bot_list if bot in self.curves
+            }
+            fleet_stats = self._subset_curve(frozenset(bot_list)).stats(now)
+        return bot_stats, fleet_stats
@@ -0,0 +1,141 @@
+"""
+Recording and replay of FTUI REST sessions.
+
+A session file is gzip compressed text, one line per response: a JSON
+header with the time since the session started, the bot's server URL and
+the request, then a tab and the response exactly as decoded from the bot.
+Failed requests are recorded with a null response, so outages replay too.
+"""
+
+import gzip
+import logging
+import threading
+from bisect import bisect_right
+from datetime import datetime, timezone
+from time import monotonic
+from urllib.parse import urlencode
+
+import rapidjson
+
+logger = logging.getLogger("ftui_session")
+
+SESSION_FORMAT = 1
+
+JSON_NUMBER_MODE = rapidjson.NM_NATIVE | rapidjson.NM_NAN
+
+
+def request_key(server, method, apipath, params) -> tuple:
+    return (server, str(method).upper(), apipath, urlencode(params) if params else "")
+
+
+class SessionRecorder:
+    """Writes every response the clients receive to a session file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.start = monotonic()
+        self.count = 0
+        self._lock = threading.Lock()
+
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.file.write(
+            rapidjson.dumps(
+                {
+                    "ftui_session": SESSION_FORMAT,
+                    "started": datetime.now(timezone.utc).isoformat(),
+                }
+            )
+            + "\n"
+        )
+
+    def record(self, server, method, apipath, params, response):
+        _, method, apipath, params = request_key(server, method, apipath, params)
+        header = rapidjson.dumps(
+            {
+                "t": round(monotonic() - self.start, 3),
+                "server": server,
+                "method": method,
+                "path": apipath,
+                "params": params,
+            }
+        )
+        body = rapidjson.dumps(response, number_mode=JSON_NUMBER_MODE, default=str)
+
+        with self._lock:
+            if self.file is not None:
+                self.file.write(f"{header}\t{body}\n")
+                self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class SessionReplay:
+    """
+    Serves the responses of a recorded session in place of the bots.
+
+    With speed > 0 the session plays back in time, speed times faster than
+    it was recorded: a request gets the last response recorded for it up to
+    the session time reached, or the first one if none was recorded yet.
+    With speed 0 each request takes the next response recorded for it,
+    so a replay sees the same data in the same order however fast it runs.
+    """
+
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = float(speed)
+        self.duration = 0
+
+        # request key -> (times, response JSON texts)
+        self.responses = {}
+        self.positions = {}
+        self._lock = threading.Lock()
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            first = f.readline()
+            if rapidjson.loads(first or "{}").get("ftui_session") != SESSION_FORMAT:
+                raise ValueError(f"{path} is not an FTUI session file")
+
+            try:
+                for line in f:
+                    header, sep, body = line.rstrip("\n").partition("\t")
+                    if not sep:
+                        continue
+                    header = rapidjson.loads(header)
+                    key = (header["server"], header["method"], header["path"], header["params"])
+
+                    times, bodies = self.responses.setdefault(key, ([], []))
+                    times.append(header["t"])
+                    bodies.append(body)
+                    self.duration = max(self.duration, header["t"])
+            except EOFError:
+                # the recording FTUI did not exit cleanly, keep what was written
+                logger.warning(f"Session file {path} is truncated")
+
+        self.start = monotonic()
+
+    @property
+    def session_time(self) -> float:
+        return (monotonic() - self.start) * self.speed
+
+    @property
+    def finished(self) -> bool:
+        return self.speed > 0 and self.session_time >= self.duration
+
+    def response(self, server, method, apipath, params):
+        """The recorded response for a request, KeyError if it was never made"""
+        key = request_key(server, method, apipath, params)
+        times, bodies = self.responses[key]
+
+        if self.speed > 0:
+            i = max(bisect_right(times, self.session_time) - 1, 0)
+        else:
+            with self._lock:
+                i = self.positions.get(key, 0)
+                self.positions[key] = min(i + 1, len(bodies) - 1)
+
+        # decoded afresh for each request, as a response from the bot would be
+        return rapidjson.loads(bodies[i], number_mode=JSON_NUMBER_MODE)
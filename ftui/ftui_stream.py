@@ -0,0 +1,92 @@
+"""Freqtrade websocket message stream for push updates in the FTUI"""
+
+import logging
+import threading
+
+import rapidjson
+
+try:
+    from websockets.sync.client import connect
+except ImportError:
+    connect = None
+
+logger = logging.getLogger("ftui_stream")
+
+# RPC message types that change the state FTUI displays
+STREAM_MESSAGE_TYPES = [
+    "entry",
+    "entry_fill",
+    "entry_cancel",
+    "exit",
+    "exit_fill",
+    "exit_cancel",
+    "new_candle",
+]
+
+
+def stream_available() -> bool:
+    return connect is not None
+
+
+class FTUIStream:
+    """
+    Background subscriber to the freqtrade `/api/v1/message/ws` channel.
+
+    Every decoded message is handed to `on_message` from the stream thread.
+    The connection is retried with a growing delay, and `connected` is False
+    whenever the socket is down, so callers know to fall back to polling.
+    """
+
+    def __init__(self, url, port, ws_token, on_message, *, retry_delay=5, max_retry_delay=120):
+        self.ws_url = f"ws://{url}:{port}/api/v1/message/ws?token={ws_token}"
+        self.on_message = on_message
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        self.connected = False
+        self._ws = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> bool:
+        if connect is None:
+            logger.warning("websockets is not installed, falling back to polling")
+            return False
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="ftui-stream")
+            self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._ws is not None:
+            self._ws.close()
+
+    def _run(self):
+        delay = self.retry_delay
+
+        while not self._stop.is_set():
+            try:
+                with connect(self.ws_url, open_timeout=10) as ws:
+                    self._ws = ws
+                    ws.send(rapidjson.dumps({"type": "subscribe", "data": STREAM_MESSAGE_TYPES}))
+                    self.connected = True
+                    delay = self.retry_delay
+
+                    for raw in ws:
+                        try:
+                            msg = rapidjson.loads(raw)
+                        except ValueError:
+                            continue
+
+                        if isinstance(msg, dict) and "type" in msg:
+                            self.on_message(msg)
+            except Exception as e:
+                logger.info(f"Websocket {self.ws_url.split('?')[0]} unavailable: {e}")
+            finally:
+                self.connected = False
+                self._ws = None
+
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_retry_delay)
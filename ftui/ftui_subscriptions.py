@@ -0,0 +1,50 @@
+"""Tracks which bot data the visible parts of the FTUI need"""
+
+import threading
+
+# data sets kept per bot in FreqText.client_dfs, see ftui_frames.FRAME_BUILDERS
+DATA_TYPES = ("op_data", "cl_data", "tag_data", "perf_data", "summary_data", "balance")
+
+
+class DataSubscriptions:
+    """
+    Subscriptions of screens, tabs and collapsibles to per-bot data sets.
+
+    Each subscription is keyed by its owner (usually a screen) and a name
+    within it (e.g. a tab or collapsible id), and asks for some data types
+    for a list of bots, or for all bots when bots is None. Only data with
+    at least one live subscription is fetched.
+    """
+
+    def __init__(self):
+        self.subs = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, owner, key, data_types, bots=None):
+        unknown = set(data_types) - set(DATA_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown data types: {', '.join(sorted(unknown))}")
+
+        with self._lock:
+            self.subs[(id(owner), key)] = (
+                frozenset(data_types),
+                None if bots is None else frozenset(bots),
+            )
+
+    def unsubscribe(self, owner, key=None):
+        """Drop one subscription of owner, or all of them when key is None"""
+        with self._lock:
+            if key is not None:
+                self.subs.pop((id(owner), key), None)
+            else:
+                for k in [k for k in self.subs if k[0] == id(owner)]:
+                    del self.subs[k]
+
+    def wanted(self, bot) -> set:
+        """Data types with a live subscription covering bot"""
+        wanted = set()
+        with self._lock:
+            for data_types, bots in self.subs.values():
+                if bots is None or bot in bots:
+                    wanted |= data_types
+        return wanted
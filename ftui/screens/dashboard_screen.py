@@ -1,11 +1,14 @@
+import threading
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 from rich.table import Table
 from rich.text import Text
 from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal
+from textual.events import ScreenResume, ScreenSuspend
 from textual.widgets import (
     Button,
     Collapsible,
@@ -21,15 +24,41 @@ from textual.worker import get_current_worker
 from textual_plotext import PlotextPlot
 
 import ftui.ftui_helpers as fth
+from ftui.ftui_fleet import fleet_exposure
+from ftui.ftui_series import lttb_indices
+from ftui.screens.modal_screens import DataFrameScreen, TradeSearchScreen
 from ftui.widgets.timed_screen import TimedScreen
 
 
 class DashboardScreen(TimedScreen):
+    BINDINGS = [
+        ("a", "show_all_closed_trades", "All Closed Trades"),
+        ("f", "show_trade_search", "Search Trades"),
+    ]
+
     COLLAP_FUNC_MAP = {
         # collapsibles
         "dsh-cp-collap": "update_cumulative_profit_plot",
+        "dsh-pp-collap": "update_dashboard_pair_performance",
+        "dsh-exp-collap": "update_dashboard_exposure",
+        "dsh-dd-collap": "update_dashboard_drawdown",
+    }
+
+    # data every bot has to keep fetched while the dashboard is shown
+    DATA_TYPES = ("op_data", "cl_data", "summary_data")
+
+    # further data needed only while a collapsible is expanded
+    COLLAP_DATA_MAP = {
+        "dsh-pp-collap": ("perf_data",),
+        "dsh-exp-collap": ("balance",),
     }
 
+    # pairs listed in the exposure panel, by stake
+    EXPOSURE_TOP_PAIRS = 15
+
+    # plotext keeps its figure in the widget, only one worker may draw at a time
+    chart_lock = threading.Lock()
+
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
 
@@ -70,6 +99,15 @@ class DashboardScreen(TimedScreen):
                         with Container(id="dash-closed-profit-container"):
                             yield Static(id="dash-closed-profit", classes="bg-static-default collap-update")
 
+                    with Collapsible(title="Exposure", id="dsh-exp-collap", collapsed=True):
+                        yield Static(id="dash-exposure", classes="bg-static-default collap-update")
+                        yield Static(
+                            id="dash-pair-exposure", classes="bg-static-default collap-update"
+                        )
+
+                    with Collapsible(title="Pair Performance", id="dsh-pp-collap", collapsed=True):
+                        yield Static(id="dash-pair-perf", classes="bg-static-default collap-update")
+
                     with Collapsible(title="Cumulative Profit", id="dsh-cp-collap", collapsed=True):
                         with Container(id="dsh-chart-container"):
                             with Horizontal(id="dsh-chart-header"):
@@ -77,7 +115,13 @@ class DashboardScreen(TimedScreen):
                                     "Refresh", id="dash-refresh-chart-button", variant="success"
                                 )
                             yield SelectionList(id="dsh-chart-bot-list", classes="bg-static-default")
-                            yield PlotextPlot(id="dash-cumprof-profit", classes="bg-static-default collap-update")
+                            with Horizontal(id="dsh-chart-plots"):
+                                yield PlotextPlot(id="dash-cumprof-profit", classes="bg-static-default collap-update")
+                                yield PlotextPlot(id="dash-open-profit", classes="bg-static-default collap-update")
+
+                    with Collapsible(title="Drawdown", id="dsh-dd-collap", collapsed=True):
+                        yield Static(id="dash-drawdown", classes="bg-static-default collap-update")
+                        yield PlotextPlot(id="dash-drawdown-plot", classes="bg-static-default collap-update")
 
                     # with Collapsible(title="Daily Trade Summary",
                     #                  id="dsh-dt-collap",
@@ -108,6 +152,36 @@ class DashboardScreen(TimedScreen):
         update_five_sec_render = self.set_interval(5, self.update_per_five_sec)
         self.register_timer(f"{self.__class__.__name__}_5sec", update_five_sec_render)
 
+    @on(ScreenResume)
+    def subscribe_data(self):
+        self.app.subscribe_data(
+            self, "screen", self.DATA_TYPES, on_refresh=self.update_dashboard_all_trade_summary
+        )
+
+        for collap_id in self.COLLAP_DATA_MAP:
+            if self.query_one(f"#{collap_id}").collapsed is False:
+                self._subscribe_collapsible(collap_id)
+
+    @on(ScreenSuspend)
+    def unsubscribe_data(self):
+        self.app.unsubscribe_data(self)
+
+    def _subscribe_collapsible(self, collap_id):
+        self.app.subscribe_data(
+            self,
+            collap_id,
+            self.COLLAP_DATA_MAP[collap_id],
+            on_refresh=getattr(self, self.COLLAP_FUNC_MAP[collap_id]),
+        )
+
+    def action_show_all_closed_trades(self) -> None:
+        dfs = DataFrameScreen()
+        dfs.data = self.app.fleet_view("cl_data")
+        self.app.push_screen(dfs)
+
+    def action_show_trade_search(self) -> None:
+        self.app.push_screen(TradeSearchScreen())
+
     async def update_per_sec(self):
         if not self.screen.is_active:
             return
@@ -132,6 +206,18 @@ class DashboardScreen(TimedScreen):
         if dsh_cp_collap.collapsed is False:
             self.update_cumulative_profit_plot()
 
+        dsh_pp_collap = self.query_one("#dsh-pp-collap")
+        if dsh_pp_collap.collapsed is False:
+            self.update_dashboard_pair_performance()
+
+        dsh_exp_collap = self.query_one("#dsh-exp-collap")
+        if dsh_exp_collap.collapsed is False:
+            self.update_dashboard_exposure()
+
+        dsh_dd_collap = self.query_one("#dsh-dd-collap")
+        if dsh_dd_collap.collapsed is False:
+            self.update_dashboard_drawdown()
+
     def _render_open_trade_data(self, data, trading_mode="spot"):
         row_data = []
 
@@ -168,7 +254,6 @@ class DashboardScreen(TimedScreen):
 
     def _render_closed_trade_data(self, data):
         row_data = []
-        data = data.sort_values(by="Close Date", ascending=False)
 
         for idx, v in data.iterrows():
             row_data.append(
@@ -202,8 +287,8 @@ class DashboardScreen(TimedScreen):
         client_dfs = self.app.client_dfs
 
         for n, cl in client_dict.items():
-            open_data = fth.get_open_dataframe_data(cl, client_dfs)
-            closed_data = fth.get_closed_dataframe_data(cl, client_dfs)
+            open_data = fth.get_open_dataframe_data(cl, client_dfs, copy=False)
+            closed_data = fth.get_closed_dataframe_data(cl, client_dfs, copy=False)
 
             tot_profit = 0
             if not open_data.empty:
@@ -216,18 +301,19 @@ class DashboardScreen(TimedScreen):
             closed_profit = closed_profit + pcc
             open_profit = open_profit + tot_profit
 
-            d = cl.get_daily_profit(days=2)
-            if d is not None and "data" in d and d["data"]:
-                daily_profit = daily_profit + d["data"][0]["abs_profit"]
-                yesterday_profit = d["data"][1]["abs_profit"]
-            w = cl.get_weekly_profit(weeks=2)
-            if w is not None and "data" in w and w["data"]:
-                weekly_profit = weekly_profit + w["data"][0]["abs_profit"]
-                last_week_profit = w["data"][1]["abs_profit"]
-            m = cl.get_monthly_profit(months=2)
-            if m is not None and "data" in m and m["data"]:
-                monthly_profit = monthly_profit + m["data"][0]["abs_profit"]
-                last_month_profit = m["data"][1]["abs_profit"]
+            t = fth.get_summary_data(cl, client_dfs)
+            if t is None:
+                continue
+
+            if not pd.isna(t["daily_profit"]):
+                daily_profit = daily_profit + t["daily_profit"]
+                yesterday_profit = t["yesterday_profit"]
+            if not pd.isna(t["weekly_profit"]):
+                weekly_profit = weekly_profit + t["weekly_profit"]
+                last_week_profit = t["last_week_profit"]
+            if not pd.isna(t["monthly_profit"]):
+                monthly_profit = monthly_profit + t["monthly_profit"]
+                last_month_profit = t["last_month_profit"]
 
         cps = round(closed_profit, 2)
         ops = round(open_profit, 2)
@@ -279,24 +365,18 @@ class DashboardScreen(TimedScreen):
     @work(group="dash_all_open_worker", exclusive=True, thread=True)
     def update_dashboard_all_open_trades(self):
         client_dict = self.app.client_dict
-        client_dfs = self.app.client_dfs
 
         trading_mode = "spot"
 
-        all_open_df = pd.DataFrame()
         for n, cl in client_dict.items():
             # if any bots are in futures mode, add leverage column
             tm = cl.get_client_config().get("trading_mode", "spot")
             if tm != "spot":
                 trading_mode = tm
-            if cl.name in client_dfs and "op_data" in client_dfs[cl.name]:
-                data = client_dfs[cl.name]["op_data"].copy()
-                if not data.empty:
-                    all_open_df = pd.concat([all_open_df, data])
 
-        row_data = self._render_open_trade_data(
-            all_open_df, trading_mode=trading_mode
-        )
+        row_data = []
+        for _, data in self.app.fleet_view("op_data").partitions:
+            row_data.extend(self._render_open_trade_data(data, trading_mode=trading_mode))
 
         dt = self.query_one("#all-open-trades-table")
         table = fth.dash_open_trades_table(
@@ -311,17 +391,13 @@ class DashboardScreen(TimedScreen):
     @work(group="dash_all_closed_worker", exclusive=True, thread=True)
     def update_dashboard_all_closed_trades(self, num_closed_trades=5) -> Table:
         client_dict = self.app.client_dict
-        client_dfs = self.app.client_dfs
         num_clients = len(client_dict)
         num_trades_per_bot = max(round(32 / num_clients), num_closed_trades) if num_clients > 0 else num_closed_trades
 
-        all_closed_df = pd.DataFrame()
-        for n, cl in client_dict.items():
-            if cl.name in client_dfs and "cl_data" in client_dfs[cl.name]:
-                data = client_dfs[cl.name]["cl_data"].copy()
-                all_closed_df = pd.concat([all_closed_df, data[:num_trades_per_bot]])
-
-        row_data = self._render_closed_trade_data(all_closed_df)
+        recent_closed = self.app.fleet_view("cl_data").head(num_trades_per_bot)
+        row_data = self._render_closed_trade_data(
+            recent_closed.sort_values(by="Close Date", ascending=False)
+        )
 
         dt = self.query_one("#dash-closed-profit")
         table = fth.dash_closed_trades_table(row_data)
@@ -331,6 +407,154 @@ class DashboardScreen(TimedScreen):
             self.app.call_from_thread(dt.update, table)
         dt.loading = False
 
+    @work(group="dash_exposure_worker", exclusive=True, thread=True)
+    def update_dashboard_exposure(self):
+        client_dict = self.app.client_dict
+        bots = [b for b in client_dict if b not in self.app.clients_disabled]
+
+        per_currency, per_pair = fleet_exposure(
+            self.app.fleet_view("op_data", bots=bots),
+            {b: client_dict[b].get_client_config()["stake_currency"] for b in bots},
+            {b: fth.get_balance_data(client_dict[b], self.app.client_dfs) for b in bots},
+        )
+
+        row_data = [
+            # ("Currency", "# Bots", "# Trades", "In Trades", "Free", "Total", "Exposure %"),
+        ]
+        for v in per_currency.itertuples(index=False):
+            row_data.append(
+                (
+                    f"{v[0]}",
+                    f"{v[1]}",
+                    f"{v[2]}",
+                    f"{round(v[3], 2)}",
+                    f"{round(v[4], 2)}",
+                    f"{round(v[5], 2)}",
+                    f"{round(v[6], 2)}",
+                )
+            )
+
+        pair_row_data = [
+            # ("Pair", "# Bots", "# Trades", "Stake", "Share %"),
+        ]
+        for v in per_pair.head(self.EXPOSURE_TOP_PAIRS).itertuples(index=False):
+            pair_row_data.append(
+                (
+                    f"{v[0]}",
+                    f"{v[2]}",
+                    f"{v[3]}",
+                    f"{round(v[4], 2)} {v[1]}",
+                    f"{round(v[5], 2)}",
+                )
+            )
+
+        dt = self.query_one("#dash-exposure")
+        pdt = self.query_one("#dash-pair-exposure")
+        table = fth.dash_exposure_table(row_data)
+        pair_table = fth.dash_pair_exposure_table(pair_row_data)
+
+        worker = get_current_worker()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(dt.update, table)
+            self.app.call_from_thread(pdt.update, pair_table)
+        dt.loading = False
+        pdt.loading = False
+
+    @work(group="dash_pair_perf_worker", exclusive=True, thread=True)
+    def update_dashboard_pair_performance(self):
+        row_data = [
+            # ("Pair", "# Bots", "# Trades", "Avg Profit %", "Total Profit"),
+        ]
+
+        bots = [b for b in self.app.client_dict if b not in self.app.clients_disabled]
+        for v in self.app.fleet_pairs.table(bots).itertuples(index=False):
+            row_data.append(
+                (
+                    f"{v[0]}",
+                    f"{v[1]}",
+                    f"{v[2]}",
+                    fth.red_or_green(round(float(v[3]), 2), justify="right"),
+                    fth.red_or_green(round(float(v[4]), 2), justify="right"),
+                )
+            )
+
+        dt = self.query_one("#dash-pair-perf")
+        table = fth.dash_pair_performance_table(row_data)
+
+        worker = get_current_worker()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(dt.update, table)
+        dt.loading = False
+
+    @staticmethod
+    def _render_drawdown_stats(stats):
+        def dur(td):
+            return "-" if td is None else str(td).split(".")[0].replace("0 days ", "")
+
+        return (
+            f"{stats['trades']}",
+            fth.red_or_green(round(stats["profit"], 2), justify="right"),
+            f"[red]{round(stats['max_drawdown'], 2)}",
+            f"[red]{round(stats['drawdown'], 2)}" if stats["drawdown"] else "0",
+            dur(stats["underwater"]),
+            dur(stats["max_underwater"]),
+            f"{stats['recoveries']}",
+            dur(stats["mean_recovery"]),
+            dur(stats["max_recovery"]),
+        )
+
+    @work(group="dash_drawdown_worker", exclusive=True, thread=True)
+    def update_dashboard_drawdown(self):
+        bots = [b for b in self.app.client_dict if b not in self.app.clients_disabled]
+        bot_stats, fleet_stats = self.app.fleet_equity.stats(bots)
+
+        row_data = [
+            (f"{bot}",) + self._render_drawdown_stats(stats) for bot, stats in bot_stats.items()
+        ]
+
+        dt = self.query_one("#dash-drawdown")
+        table = fth.dash_drawdown_table(row_data, self._render_drawdown_stats(fleet_stats))
+
+        worker = get_current_worker()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(dt.update, table)
+        dt.loading = False
+
+        chart_container = self.query_one("#dash-drawdown-plot")
+        cw, _ = chart_container.container_size
+
+        # each series keeps its own peaks and troughs, on the shared dates of both
+        curve = self.app.fleet_equity.curve(bots)
+        points = max(cw, 50) // 2
+        curve = curve.iloc[
+            np.union1d(
+                lttb_indices(curve["equity"].to_numpy(), points),
+                lttb_indices(curve["drawdown"].to_numpy(), points),
+            )
+        ]
+
+        with self.chart_lock:
+            cplt = chart_container.plt
+            cplt.clear_data()
+            cplt.clf()
+
+            if len(curve) > 1:
+                cplt.date_form("Y-m-d H:M")
+                dates = cplt.datetimes_to_string(curve.index)
+                cplt.plot(
+                    dates,
+                    curve["equity"].to_numpy(),
+                    color=self.app.COLOURS.profit_chart_col,
+                    label="Equity",
+                )
+                cplt.plot(dates, curve["drawdown"].to_numpy(), color="red", label="Drawdown")
+                cplt.ylabel("Profit")
+
+        self.app.call_from_thread(chart_container.refresh)
+
+        if not worker.is_cancelled:
+            self.app.call_from_thread(chart_container.set_loading, False)
+
     @work(group="dash_all_trade_worker", exclusive=False, thread=True)
     def update_dashboard_all_trade_summary(self):
         client_dict = self.app.client_dict
@@ -345,8 +569,8 @@ class DashboardScreen(TimedScreen):
         all_losses = 0
 
         for n, cl in client_dict.items():
-            open_data = fth.get_open_dataframe_data(cl, client_dfs)
-            closed_data = fth.get_closed_dataframe_data(cl, client_dfs)
+            open_data = fth.get_open_dataframe_data(cl, client_dfs, copy=False)
+            closed_data = fth.get_closed_dataframe_data(cl, client_dfs, copy=False)
 
             open_profit = 0
             mean_prof_w = 0
@@ -385,9 +609,10 @@ class DashboardScreen(TimedScreen):
 
             expectancy = ((winrate / 100) * mean_prof_w) - ((loserate / 100) * mean_prof_l)
 
-            t = cl.get_total_profit()
+            t = fth.get_summary_data(cl, client_dfs)
             if t is None:
-                return []
+                # no data has ever been retrieved from this bot
+                continue
 
             pcc = round(float(t["profit_closed_coin"]), 2)
             bot_start_date = datetime.strptime(
@@ -404,9 +629,11 @@ class DashboardScreen(TimedScreen):
                 f"[white]/[purple]{t['closed_trade_count']}"
             )
 
+            bot_name = f"{n}" if not cl.is_stale else f"{n} [red](stale)"
+
             row_data.append(
                 (
-                    f"{n}",
+                    bot_name,
                     f"{bot_start_date}",
                     trade_cnt_str,
                     fth.red_or_green(round(open_profit, 2), justify="right"),
@@ -442,46 +669,40 @@ class DashboardScreen(TimedScreen):
 
     @work(group="dash_chart_worker", exclusive=False, thread=True)
     def update_cumulative_profit_plot(self, bot_list=None):
-        client_dfs = self.app.client_dfs
-
         bot_list = self.query_one("#dsh-chart-bot-list").selected
+        if not bot_list:
+            bot_list = list(self.app.client_dict.keys())
 
-        all_cum_data = pd.DataFrame()
-        if "all_closed" in client_dfs:
-            if bot_list is None or not bot_list:
-                all_cum_data = fth.dash_cumulative_profit_plot_data(
-                    client_dfs["all_closed"]
-                )
-            else:
-                all_cum_data = fth.dash_cumulative_profit_plot_data(
-                    client_dfs["all_closed"],
-                    bot_list=bot_list
-                )
+        chart_container = self.query_one("#dash-cumprof-profit")
+        cw, ch = chart_container.container_size
 
-        if "plot_cumprof" in all_cum_data.columns:
-            chart_container = self.query_one("#dash-cumprof-profit")
-            cplt = chart_container.plt
-            cplt.clear_data()
-            cplt.clf()
+        # no point handing plotext more points than the chart has columns
+        all_cum_data = self.app.fleet_profit.cumulative_profit(
+            bot_list, width=max(cw, 50)
+        )
 
-            dfmt = "Y-m-d"
-            cplt.date_form(dfmt)
+        if "plot_cumprof" in all_cum_data.columns:
+            with self.chart_lock:
+                cplt = chart_container.plt
+                cplt.clear_data()
+                cplt.clf()
 
-            all_cum_data.index = all_cum_data.index.tz_localize(None)
+                dfmt = "Y-m-d"
+                cplt.date_form(dfmt)
 
-            dates = cplt.datetimes_to_string(all_cum_data.index)
+                dates = cplt.datetimes_to_string(all_cum_data.index)
 
-            cplt.plot(
-                dates,
-                all_cum_data["plot_cumprof"].values,
-                color=self.app.COLOURS.profit_chart_col,
-            )
+                cplt.plot(
+                    dates,
+                    all_cum_data["plot_cumprof"].values,
+                    color=self.app.COLOURS.profit_chart_col,
+                )
 
-            cplt.ylim(
-                all_cum_data["plot_cumprof"].min() * 0.99,
-                all_cum_data["plot_cumprof"].max() * 1.01,
-            )
-            cplt.ylabel("Profit")
+                cplt.ylim(
+                    all_cum_data["plot_cumprof"].min() * 0.99,
+                    all_cum_data["plot_cumprof"].max() * 1.01,
+                )
+                cplt.ylabel("Profit")
 
             self.app.call_from_thread(chart_container.refresh)
 
@@ -489,6 +710,36 @@ class DashboardScreen(TimedScreen):
             if not worker.is_cancelled:
                 self.app.call_from_thread(chart_container.set_loading, False)
 
+        self.update_open_profit_plot(bot_list)
+
+    def update_open_profit_plot(self, bot_list):
+        chart_container = self.query_one("#dash-open-profit")
+        cw, ch = chart_container.container_size
+
+        open_data = self.app.open_profit_history.history(bot_list)
+        open_data = open_data.iloc[lttb_indices(open_data.to_numpy(), max(cw, 50))]
+
+        with self.chart_lock:
+            cplt = chart_container.plt
+            cplt.clear_data()
+            cplt.clf()
+            cplt.title("Open Profit")
+
+            if len(open_data) > 1:
+                cplt.date_form("Y-m-d H:M")
+                cplt.plot(
+                    cplt.datetimes_to_string(open_data.index.tz_convert(None)),
+                    open_data.to_numpy(),
+                    color=self.app.COLOURS.profit_chart_col,
+                )
+                cplt.ylabel("Profit")
+
+        self.app.call_from_thread(chart_container.refresh)
+
+        worker = get_current_worker()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(chart_container.set_loading, False)
+
     @on(SelectionList.SelectedChanged)
     def update_cum_plot_from_list(self) -> None:
         chart_container = self.query_one("#dash-cumprof-profit")
@@ -510,6 +761,12 @@ class DashboardScreen(TimedScreen):
             for child in collap_children:
                 child.loading = True
 
+        if collap.id in self.COLLAP_DATA_MAP:
+            if collap.collapsed is False:
+                self._subscribe_collapsible(collap.id)
+            else:
+                self.app.unsubscribe_data(self, collap.id)
+
         if collap.id in self.COLLAP_FUNC_MAP:
             getattr(self, self.COLLAP_FUNC_MAP[collap.id])()
         else:
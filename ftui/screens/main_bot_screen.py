@@ -1,3 +1,4 @@
+import threading
 from datetime import datetime, timezone
 
 import numpy as np
@@ -5,7 +6,7 @@ import pandas as pd
 from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical
-from textual.events import ScreenResume
+from textual.events import ScreenResume, ScreenSuspend
 from textual.widgets import (
     Button,
     Collapsible,
@@ -25,6 +26,12 @@ from textual.worker import get_current_worker
 from textual_plotext import PlotextPlot
 
 import ftui.ftui_helpers as fth
+from ftui.ftui_series import (
+    ResampledCandles,
+    aggregate_ohlc,
+    higher_timeframes,
+    timeframe_to_minutes,
+)
 from ftui.screens.modal_screens import TradeInfoScreen
 from ftui.widgets.label_item import LabelItem
 from ftui.widgets.linkable_markdown_viewer import LinkableMarkdown
@@ -32,6 +39,20 @@ from ftui.widgets.timed_screen import TimedScreen
 
 
 class MainBotScreen(TimedScreen):
+    BINDINGS = [
+        ("plus", "zoom_chart(0.5)", "Zoom In"),
+        ("minus", "zoom_chart(2)", "Zoom Out"),
+    ]
+
+    # candles fetched once per pair, then merged to fit the chart width
+    CHART_HISTORY = 1000
+    CHART_MIN_WINDOW = 50
+    CLOSED_TRADES_PAGE_SIZE = 50
+
+    # chart workers share the candle caches and the plot; held while they change or draw
+    # them, never while candles are fetched
+    chart_lock = threading.Lock()
+
     TAB_FUNC_MAP = {
         # tabs
         "open-trades-tab": "update_open_trades_tab",
@@ -48,9 +69,24 @@ class MainBotScreen(TimedScreen):
         "bot-chrt-collap": "update_chart_container",
     }
 
+    # data the selected bot keeps fetched while this screen is shown
+    DATA_TYPES = ("op_data", "cl_data", "summary_data")
+
+    # further data needed only while a tab is active
+    TAB_DATA_MAP = {
+        "tag-summary-tab": ("tag_data",),
+        "perf-summary-tab": ("perf_data",),
+    }
+
     client_select_options = [("Select Bot Client...", "Select.BLANK")]
     prev_chart_pair = None
     chart_data = {}
+    chart_versions = {}
+    chart_window = 200
+    chart_timeframe = None
+    chart_resampled = {}
+    closed_trades_page = 0
+    closed_trades_total = 0
 
     # LAYOUT
     def compose(self) -> ComposeResult:
@@ -72,6 +108,9 @@ class MainBotScreen(TimedScreen):
                             yield Button(
                                 "Refresh", id="bot-refresh-chart-button", variant="success"
                             )
+                            yield Select(
+                                [], prompt="Timeframe", id="bot-chart-timeframe"
+                            )
 
                         yield ListView(id="whitelist", classes="bg-static-default")
                         yield PlotextPlot(id="bot-chart", classes="bg-static-default")
@@ -81,6 +120,10 @@ class MainBotScreen(TimedScreen):
                         yield Static(id="open-trades-table", classes="bg-static-default")
 
                     with TabPane("Closed Trades", id="closed-trades-tab"):
+                        with Horizontal(id="closed-trades-header"):
+                            yield Button("< Newer", id="closed-trades-newer-button")
+                            yield Static(id="closed-trades-page")
+                            yield Button("Older >", id="closed-trades-older-button")
                         yield Static(id="closed-trades-table", classes="bg-static-default")
 
                     with TabPane("Tag Summary", id="tag-summary-tab"):
@@ -112,6 +155,8 @@ class MainBotScreen(TimedScreen):
                                 yield ProgressBar(
                                     id="sysinfo-progress-ram", total=100, show_eta=False
                                 )
+                            yield Static(id="sysinfo-memory")
+                            yield Static(id="sysinfo-alerts")
 
                     if self.app.debug_mode:
                         with TabPane("Debug", id="debug-tab"):
@@ -156,18 +201,45 @@ class MainBotScreen(TimedScreen):
             if tab_id != "open-trades-tab" and tab_id in self.TAB_FUNC_MAP:
                 getattr(self, self.TAB_FUNC_MAP[tab_id])(tab_id, bot_id)
 
+            # redraw as soon as the websocket stream announces a new candle
+            cl = self.app.client_dict[bot_id]
+            if cl.stream_connected and self.prev_chart_pair is not None:
+                ckey = f"{self.prev_chart_pair}_{cl.get_client_config()['timeframe']}"
+                if (
+                    ckey in self.chart_versions
+                    and cl.candle_version(self.prev_chart_pair) != self.chart_versions[ckey]
+                ):
+                    self.update_chart(bot_id, pair=self.prev_chart_pair)
+
     async def update_per_one_min(self):
         if not self.screen.is_active:
             return
 
         bot_id = self._get_bot_id_from_client_list()
         if bot_id is not None and bot_id != "Select.BLANK":
-            self.update_chart(bot_id, pair=self.prev_chart_pair)
+            # with a live stream, new candles trigger the chart update instead
+            if not self.app.client_dict[bot_id].stream_connected:
+                self.update_chart(bot_id, pair=self.prev_chart_pair)
             self.update_whitelist(bot_id)
 
     def action_update_chart(self, bot_id, pair) -> None:
         self.update_chart(bot_id, pair)
 
+    def action_zoom_chart(self, factor) -> None:
+        self.chart_window = int(
+            min(max(self.chart_window * factor, self.CHART_MIN_WINDOW), self.CHART_HISTORY)
+        )
+
+        bot_id = self._get_bot_id_from_client_list()
+        if bot_id is not None and bot_id != "Select.BLANK":
+            self.redraw_chart(bot_id)
+
+    def on_resize(self) -> None:
+        bot_id = self._get_bot_id_from_client_list()
+        if bot_id is not None and bot_id != "Select.BLANK":
+            # wait for the new layout so the chart size is current
+            self.call_after_refresh(self.redraw_chart, bot_id)
+
     def action_show_trade_info_dialog(self, trade_id, cl_name) -> None:
         tis = TradeInfoScreen()
         tis.trade_id = trade_id
@@ -194,11 +266,31 @@ class MainBotScreen(TimedScreen):
         chart_container.loading = True
         self.update_chart(bot_id, pair=self.prev_chart_pair, refresh=True)
 
+    @on(Button.Pressed, "#closed-trades-newer-button")
+    def closed_trades_newer_pressed(self) -> None:
+        self.change_closed_trades_page(-1)
+
+    @on(Button.Pressed, "#closed-trades-older-button")
+    def closed_trades_older_pressed(self) -> None:
+        self.change_closed_trades_page(1)
+
+    def change_closed_trades_page(self, step) -> None:
+        num_pages = -(-self.closed_trades_total // self.CLOSED_TRADES_PAGE_SIZE)
+        page = min(max(self.closed_trades_page + step, 0), max(num_pages - 1, 0))
+        if page == self.closed_trades_page:
+            return
+
+        self.closed_trades_page = page
+        bot_id = self._get_bot_id_from_client_list()
+        if bot_id is not None and bot_id != "Select.BLANK":
+            self.update_closed_trades_tab("closed-trades-tab", bot_id)
+
     def on_tabbed_content_tab_activated(self, event: TabbedContent.TabActivated) -> None:
-        tab_id = event.tab.id
+        tab_id = event.pane.id
         bot_id = self._get_bot_id_from_client_list()
 
         if bot_id is not None and bot_id != "Select.BLANK":
+            self.subscribe_data(bot_id, tab_id)
             if tab_id in self.TAB_FUNC_MAP:
                 getattr(self, self.TAB_FUNC_MAP[tab_id])(tab_id, bot_id)
 
@@ -206,6 +298,48 @@ class MainBotScreen(TimedScreen):
         if tab_id in self.TAB_FUNC_MAP:
             getattr(self, self.TAB_FUNC_MAP[tab_id])(tab_id, bot_id)
 
+    @on(ScreenResume)
+    def resubscribe_data(self):
+        bot_id = self._get_bot_id_from_client_list()
+        if bot_id is not None and bot_id != "Select.BLANK":
+            self.subscribe_data(bot_id)
+        else:
+            self._subscribe_select()
+
+    def _subscribe_select(self):
+        # the bot select shows the open trade count of every bot
+        self.app.subscribe_data(
+            self, "select", ("summary_data",), on_refresh=self.update_select_options
+        )
+
+    @on(ScreenSuspend)
+    def unsubscribe_data(self):
+        self.app.unsubscribe_data(self)
+
+    def subscribe_data(self, bot_id, tab_id=None):
+        """Only the selected bot, and only the data of the active tab, is kept fetched"""
+        if tab_id is None:
+            tab_id = self._get_active_tab_id()
+
+        self.app.unsubscribe_data(self)
+        self._subscribe_select()
+        self.app.subscribe_data(
+            self,
+            "screen",
+            self.DATA_TYPES,
+            bots=[bot_id],
+            on_refresh=lambda: self.update_trades_summary(bot_id),
+        )
+
+        if tab_id in self.TAB_DATA_MAP:
+            self.app.subscribe_data(
+                self,
+                tab_id,
+                self.TAB_DATA_MAP[tab_id],
+                bots=[bot_id],
+                on_refresh=lambda: self.tab_select_func(tab_id, bot_id),
+            )
+
     def _get_active_tab_id(self):
         try:
             cont = self.query_one("#right")
@@ -217,7 +351,7 @@ class MainBotScreen(TimedScreen):
     def _get_tab(self, tab_id):
         return next(self.query(f"#{tab_id}").results(TabPane))
 
-    @on(Select.Changed)
+    @on(Select.Changed, "#client-select")
     def select_changed(self, event: Select.Changed) -> None:
         event.stop()
 
@@ -226,14 +360,38 @@ class MainBotScreen(TimedScreen):
         if bot_id != "Select.BLANK":
             self.query_one("#sel-bot-title").update(bot_id)
             self.update_trades_summary(bot_id)
+            self.update_timeframe_options(bot_id)
+            self.closed_trades_page = 0
+            self.subscribe_data(bot_id)
 
-            # update all tabs when select changed
-            for tab in self.TAB_FUNC_MAP.keys():
-                self.update_tab(tab, bot_id)
+            # other tabs are updated when they are activated
+            self.update_tab(self._get_active_tab_id(), bot_id)
 
             self.update_whitelist(bot_id)
             self.update_chart(bot_id)
 
+    def update_timeframe_options(self, bot_id):
+        timeframe = self.app.client_dict[bot_id].get_client_config()["timeframe"]
+        self.chart_timeframe = timeframe
+
+        tf_select = self.query_one("#bot-chart-timeframe")
+        with self.prevent(Select.Changed):
+            tf_select.set_options([(tf, tf) for tf in [timeframe] + higher_timeframes(timeframe)])
+            tf_select.value = timeframe
+
+    @on(Select.Changed, "#bot-chart-timeframe")
+    def chart_timeframe_changed(self, event: Select.Changed) -> None:
+        event.stop()
+
+        if event.value == Select.BLANK or event.value == self.chart_timeframe:
+            return
+
+        self.chart_timeframe = str(event.value)
+
+        bot_id = self._get_bot_id_from_client_list()
+        if bot_id is not None and bot_id != "Select.BLANK":
+            self.redraw_chart(bot_id)
+
     @work(group="selswitch_workers", exclusive=True, thread=True)
     @on(ScreenResume)
     def update_select_options(self):
@@ -242,8 +400,10 @@ class MainBotScreen(TimedScreen):
         options = []
 
         for name, cl in client_dict.items():
-            ot, mt = cl.get_open_trade_count()
-            options.append((f"{name} : {ot}/{mt} active trades", name))
+            t = fth.get_summary_data(cl, self.app.client_dfs)
+            ot, mt = (t["open_trade_count"], t["max_open_trades"]) if t is not None else (0, 0)
+            stale = " (stale)" if cl.is_stale else ""
+            options.append((f"{name} : {ot}/{mt} active trades{stale}", name))
 
         self.client_select_options = options
 
@@ -277,8 +437,8 @@ class MainBotScreen(TimedScreen):
         client_dfs = self.app.client_dfs
 
         cl = client_dict[bot_id]
-        open_data = fth.get_open_dataframe_data(cl, client_dfs)
-        closed_data = fth.get_closed_dataframe_data(cl, client_dfs)
+        open_data = fth.get_open_dataframe_data(cl, client_dfs, copy=False)
+        closed_data = fth.get_closed_dataframe_data(cl, client_dfs, copy=False)
 
         self._render_trades_summary(cl, open_data, closed_data)
 
@@ -327,7 +487,7 @@ class MainBotScreen(TimedScreen):
 
         expectancy = ((winrate / 100) * mean_prof_w) - ((loserate / 100) * mean_prof_l)
 
-        t = cl.get_total_profit()
+        t = fth.get_summary_data(cl, self.app.client_dfs)
         if t is None:
             return []
 
@@ -446,50 +606,62 @@ class MainBotScreen(TimedScreen):
         client_dict = self.app.client_dict
 
         cl = client_dict[bot_id]
-        self._render_closed_trades_summary(cl)
+        page = self.closed_trades_page
+        self._render_closed_trades_summary(cl, page)
 
-    def _render_closed_trades_summary(self, ftuic):
-        client_dfs = self.app.client_dfs
+        # fetch the next page while this one is being read
+        worker = get_current_worker()
+        if not worker.is_cancelled:
+            cl.get_closed_trades_page(page + 1, self.CLOSED_TRADES_PAGE_SIZE)
 
+    def _render_closed_trades_summary(self, ftuic, page=0):
         row_data = [
             # ("ID", "Pair", "Profit %", "Profit", "Open Date", "Dur.", "Entry", "Exit"),
         ]
 
-        if ftuic.name in client_dfs and "cl_data" in client_dfs[ftuic.name]:
-            trade_data = client_dfs[ftuic.name]["cl_data"]
-            for idx, v in trade_data.iterrows():
-                render_data = (
-                    # Text.styled(str(v['ID']), Style(
-                    #     meta={"@click": f"show_trade_info_dialog('{str(v['ID'])}', '{ftuic.name}')"},
-                    #     color=self.app.COLOURS['link_col']
-                    # )),
-                    f"[@click=screen.show_trade_info_dialog('{v['ID']}', '{ftuic.name}')]{v['ID']}[/]",
-                    f"[@click=screen.update_chart('{ftuic.name}', '{v['Pair']}')]{v['Pair']}[/]",
-                    f"{v['Stake Amount']}",
-                )
+        page_size = self.CLOSED_TRADES_PAGE_SIZE
+        trades, total = ftuic.get_closed_trades_page(page, page_size)
+        self.closed_trades_total = total
 
-                if ftuic.get_client_config().get("trading_mode") != "spot":
-                    render_data = render_data + (f"{v['Leverage']}",)
+        for t in trades:
+            render_data = (
+                f"[@click=screen.show_trade_info_dialog('{t.trade_id}', '{ftuic.name}')]{t.trade_id}[/]",
+                f"[@click=screen.update_chart('{ftuic.name}', '{t.pair}')]{t.pair}[/]",
+                f"{t.stake_amount}",
+            )
 
-                render_data = render_data + (
-                    fth.red_or_green(float(v["Profit %"]), justify="right"),
-                    fth.red_or_green(float(v["Profit"]), justify="right"),
-                    f"[cyan]{str(v['Open Date']).split('+')[0]}",
-                    str(v["Dur."]).split(".")[0].replace("0 days ", ""),
-                    f"{v['Entry']}",
-                    f"{v['Exit']}",
-                )
+            if ftuic.get_client_config().get("trading_mode") != "spot":
+                render_data = render_data + (f"{t.leverage}",)
+
+            render_data = render_data + (
+                fth.red_or_green(float(t.profit_pct), justify="right"),
+                fth.red_or_green(round(float(t.profit_abs), 2), justify="right"),
+                f"[cyan]{t.open_date}",
+                str(t.close_date - t.open_date).split(".")[0].replace("0 days ", ""),
+                f"{t.enter_tag}",
+                f"{t.exit_reason}",
+            )
 
-                row_data.append(render_data)
+            row_data.append(render_data)
 
         dt = self.query_one("#closed-trades-table")
         table = fth.bot_closed_trades_table(
             row_data, trading_mode=ftuic.get_client_config().get("trading_mode")
         )
 
+        if total > 0:
+            first = page * page_size + 1
+            page_text = (
+                f"Trades {first}-{first + len(trades) - 1} of {total} "
+                f"(page {page + 1}/{-(-total // page_size)})"
+            )
+        else:
+            page_text = "No closed trades"
+
         worker = get_current_worker()
         if not worker.is_cancelled:
             self.app.call_from_thread(dt.update, table)
+            self.app.call_from_thread(self.query_one("#closed-trades-page").update, page_text)
         dt.loading = False
 
     # bot tag summary tab
@@ -508,7 +680,8 @@ class MainBotScreen(TimedScreen):
         ]
 
         tag_data = fth.get_tag_dataframe_data(ftuic, client_dfs)
-        tag_data = tag_data.sort_values(by="Profit", ascending=False)
+        if not tag_data.empty:
+            tag_data = tag_data.sort_values(by="Profit", ascending=False)
 
         for idx, v in tag_data.iterrows():
             row_data.append(
@@ -536,10 +709,9 @@ class MainBotScreen(TimedScreen):
         client_dfs = self.app.client_dfs
 
         chart_container = self.query_one("#bot-chart")
-        cw, ch = chart_container.container_size
 
         cl = client_dict[bot_id]
-        open_data = fth.get_open_dataframe_data(cl, client_dfs)
+        open_data = fth.get_open_dataframe_data(cl, client_dfs, copy=False)
         if not open_data.empty:
             if pair is None:
                 if self.prev_chart_pair is None:
@@ -553,7 +725,7 @@ class MainBotScreen(TimedScreen):
                 if self.prev_chart_pair is not None:
                     pair = self.prev_chart_pair
                 else:
-                    closed_data = fth.get_closed_dataframe_data(cl, client_dfs)
+                    closed_data = fth.get_closed_dataframe_data(cl, client_dfs, copy=False)
 
                     if not closed_data.empty:
                         pair = closed_data["Pair"].iloc[0]
@@ -564,15 +736,23 @@ class MainBotScreen(TimedScreen):
                 self.prev_chart_pair = pair
 
         ckey = f"{pair}_{cl.get_client_config()['timeframe']}"
+        self.chart_versions[ckey] = cl.candle_version(pair)
+
         if ckey not in self.chart_data or refresh:
             worker = get_current_worker()
             if not worker.is_cancelled:
                 self.app.call_from_thread(chart_container.set_loading, True)
 
-            data = cl.get_pair_dataframe(pair, limit=min(max(round(cw / 2), 50), 200))
+            data = cl.get_pair_dataframe(
+                pair, limit=self.CHART_HISTORY, indicators=cl.chart_indicators
+            )
             if data is not None and not data.empty:
-                self.chart_data[ckey] = data[["date", "Open", "Close", "High", "Low"]]
-                self._render_chart(cl, pair, self.chart_data[ckey])
+                with self.chart_lock:
+                    for rkey in [k for k in self.chart_resampled if k.startswith(f"{ckey}_")]:
+                        del self.chart_resampled[rkey]
+
+                    self.chart_data[ckey] = data
+                    self._render_chart(cl, pair, self.chart_data[ckey])
             else:
                 msg = (
                     f"No data for {pair} [{cl.get_client_config()['timeframe']}] available. "
@@ -584,22 +764,28 @@ class MainBotScreen(TimedScreen):
                     severity="warning",
                 )
         else:
-            # check if new data is available
-            data = cl.get_pair_dataframe(pair, limit=1)
+            # check if new data is available, fetching only the candles missed since the last one
+            last_date = self.chart_data[ckey]["date"].iloc[-1]
+            data = cl.get_pair_dataframe(
+                pair,
+                limit=self._missing_candles(cl, last_date),
+                indicators=cl.chart_indicators,
+            )
             if data is not None and not data.empty:
-                last_date = self.chart_data[ckey].iloc[-1]["date"]
-                new_data = data[["date", "Open", "Close", "High", "Low"]].loc[
-                    data["date"] > last_date
-                ]
-                if not new_data.empty:
-                    worker = get_current_worker()
-                    if not worker.is_cancelled:
-                        self.app.call_from_thread(chart_container.set_loading, True)
+                with self.chart_lock:
+                    # another chart worker may have added candles during the fetch
+                    last_date = self.chart_data[ckey]["date"].iloc[-1]
+                    new_data = data.loc[data["date"] > last_date]
+                    if not new_data.empty:
+                        worker = get_current_worker()
+                        if not worker.is_cancelled:
+                            self.app.call_from_thread(chart_container.set_loading, True)
 
-                    self.chart_data[ckey] = pd.concat([self.chart_data[ckey], new_data])
-                    self.chart_data[ckey].drop(self.chart_data[ckey].head(1).index, inplace=True)
+                        self.chart_data[ckey] = pd.concat(
+                            [self.chart_data[ckey], new_data], ignore_index=True
+                        ).iloc[-self.CHART_HISTORY :]
 
-                self._render_chart(cl, pair, self.chart_data[ckey])
+                    self._render_chart(cl, pair, self.chart_data[ckey])
 
             else:
                 msg = (
@@ -612,11 +798,41 @@ class MainBotScreen(TimedScreen):
                     severity="warning",
                 )
 
+    def _missing_candles(self, ftuic, last_date) -> int:
+        tf_mins = timeframe_to_minutes(ftuic.get_client_config()["timeframe"])
+        last_date = pd.Timestamp(last_date)
+        if last_date.tzinfo is None:
+            last_date = last_date.tz_localize("UTC")
+        elapsed = pd.Timestamp.now(tz="UTC") - last_date
+        missing = int(elapsed / pd.Timedelta(minutes=tf_mins)) + 1
+        return min(max(missing, 1), self.CHART_HISTORY)
+
+    @work(group="bot_chart_worker", exclusive=False, thread=True)
+    def redraw_chart(self, bot_id):
+        """Re-render the current pair from the candle cache, without fetching"""
+        cl = self.app.client_dict[bot_id]
+        with self.chart_lock:
+            ckey = f"{self.prev_chart_pair}_{cl.get_client_config()['timeframe']}"
+            if ckey in self.chart_data:
+                self._render_chart(cl, self.prev_chart_pair, self.chart_data[ckey])
+
     def _render_chart(self, ftuic, pair, data):
         chart_container = self.query_one("#bot-chart")
         cw, ch = chart_container.container_size
 
-        data = data.copy()
+        # higher timeframes are resampled locally from the cached base candles
+        base_timeframe = ftuic.get_client_config()["timeframe"]
+        timeframe = self.chart_timeframe or base_timeframe
+        if timeframe != base_timeframe:
+            rkey = f"{pair}_{base_timeframe}_{timeframe}"
+            if rkey not in self.chart_resampled:
+                self.chart_resampled[rkey] = ResampledCandles(timeframe)
+            data = self.chart_resampled[rkey].update(data)
+
+        # show the zoom window, merged into as many candles as fit the chart
+        data = aggregate_ohlc(
+            data.iloc[-self.chart_window :], max(round(cw / 2), self.CHART_MIN_WINDOW)
+        ).copy()
         if not data.empty:
             cplt = chart_container.plt
             cplt.clear_data()
@@ -641,17 +857,14 @@ class MainBotScreen(TimedScreen):
                 # candlestick
                 dates = cplt.datetimes_to_string(data.index)
 
-                cplt.title(f"{pair} ({ftuic.get_client_config()['timeframe']})")
+                cplt.title(f"{pair} ({timeframe})")
                 cplt.xlabel("Date")
 
                 # stop plotext crashing if having to plot tiny values
                 ytick_labels = None
                 if ymax < 0.00001 or ymin < 0.00001:
                     print("Scaling up by 10000")
-                    data["Low"] = data["Low"] * 100000
-                    data["High"] = data["High"] * 100000
-                    data["Open"] = data["Open"] * 100000
-                    data["Close"] = data["Close"] * 100000
+                    data = data * 100000
                     ymin = data["Low"].min()
                     ymax = data["High"].max()
                     yrange = ymax - ymin
@@ -662,13 +875,25 @@ class MainBotScreen(TimedScreen):
                 if ytick_labels is not None:
                     cplt.yticks(yticks, ytick_labels)
 
-                cplt.candlestick(dates, data)
+                # plotext indexes the columns by position
+                cplt.candlestick(
+                    dates, {col: data[col].tolist() for col in ["Open", "Close", "High", "Low"]}
+                )
+
+                # indicator overlays, skipping the strategy's warmup NaNs
+                for col in data.columns.difference(["Open", "Close", "High", "Low"], sort=False):
+                    values = data[col].to_numpy(dtype=float)
+                    valid = ~np.isnan(values)
+                    if valid.any():
+                        cplt.plot(
+                            np.asarray(dates)[valid].tolist(), values[valid].tolist(), label=col
+                        )
 
                 # scatter
                 client_dfs = self.app.client_dfs
-                open_data = fth.get_open_dataframe_data(ftuic, client_dfs)
+                open_data = fth.get_open_dataframe_data(ftuic, client_dfs, copy=False)
                 open_data = open_data[open_data["Pair"] == pair]
-                closed_data = fth.get_closed_dataframe_data(ftuic, client_dfs)
+                closed_data = fth.get_closed_dataframe_data(ftuic, client_dfs, copy=False)
                 closed_data = closed_data[closed_data["Pair"] == pair]
 
                 all_trades = pd.concat([open_data, closed_data])
@@ -761,7 +986,8 @@ class MainBotScreen(TimedScreen):
         ]
 
         perf_data = fth.get_perf_dataframe_data(ftuic, client_dfs)
-        perf_data = perf_data.sort_values(by="Total Profit", ascending=False)
+        if not perf_data.empty:
+            perf_data = perf_data.sort_values(by="Total Profit", ascending=False)
 
         for idx, v in perf_data.iterrows():
             row_data.append(
@@ -887,6 +1113,20 @@ class MainBotScreen(TimedScreen):
                 dtt.update(f"{np.mean(sysinfo['cpu_pct']):>3.0f}%")
                 dtp.update(progress=sysinfo["ram_pct"])
 
+        dtm = self.query_one("#sysinfo-memory")
+        table = fth.bot_memory_table(ftuic.memory_report())
+
+        worker = get_current_worker()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(dtm.update, table)
+
+        if self.app.alerts is not None:
+            dta = self.query_one("#sysinfo-alerts")
+            table = fth.alert_stats_table(self.app.alerts.stats())
+
+            if not worker.is_cancelled:
+                self.app.call_from_thread(dta.update, table)
+
     def debug(self, msg):
         debuglog = self.query_one("#debug-log")
         debuglog.write(msg)
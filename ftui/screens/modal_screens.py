@@ -1,14 +1,19 @@
 import pandas as pd
+from textual import work
 from textual.app import ComposeResult
-from textual.containers import Container
+from textual.containers import Container, Horizontal
+from textual.css.query import NoMatches
 from textual.screen import ModalScreen
 from textual.widgets import (
-    DataTable,
     Footer,
+    Input,
     Static,
 )
+from textual.worker import get_current_worker
 
 import ftui.ftui_client as ftuic
+from ftui.ftui_series import TIMEFRAME_UNITS, timeframe_to_minutes
+from ftui.widgets.virtual_table import VirtualTable
 
 
 class BasicModal(ModalScreen[int]):
@@ -34,28 +39,168 @@ class DataFrameScreen(BasicModal):
         )
         yield Footer()
 
-    def build_dataframe_screen(self, df) -> DataTable:
-        dt = DataTable(classes="full-width")
+    def build_dataframe_screen(self, df) -> VirtualTable:
+        # only the visible rows are formatted, so large fleet frames open at once
+        return VirtualTable(df, classes="full-width")
 
-        dt.clear(columns=True)
 
-        dt.add_columns(*df.columns)
-        for row in df.itertuples(index=False):
-            dt.add_row(*[str(x) for x in row])
-        return dt
+class TradeSearchScreen(BasicModal):
+    # input id, placeholder, and the index column it filters
+    CATEGORY_FILTERS = [
+        ("search-bot", "Bots", None),
+        ("search-pair", "Pairs", "Pair"),
+        ("search-entry", "Entry tags", "Entry"),
+        ("search-exit", "Exit reasons", "Exit"),
+        ("search-dir", "L/S", "S/L"),
+    ]
+    RANGE_FILTERS = [
+        ("search-from", "From (date or 7d)", "Close Date"),
+        ("search-to", "To (date)", "Close Date"),
+        ("search-min", "Min profit %", "Profit %"),
+        ("search-max", "Max profit %", "Profit %"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        with Container(id="search-dialog"):
+            with Horizontal(id="search-filters"):
+                for input_id, placeholder, _ in self.CATEGORY_FILTERS + self.RANGE_FILTERS:
+                    yield Input(placeholder=placeholder, id=input_id)
+            yield Static("Comma separate multiple values", id="search-summary")
+            yield VirtualTable(id="search-results")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        # the dashboard stops fetching while this is open, keep the closed trades current
+        self.app.subscribe_data(self, "search", ("cl_data",), on_refresh=self.run_search)
+        self.run_search()
+
+    def on_unmount(self) -> None:
+        self.app.unsubscribe_data(self)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        event.stop()
+        self.run_search()
+
+    @staticmethod
+    def _parse_bound(text, is_date):
+        text = text.strip()
+        if not text:
+            return None
+
+        if not is_date:
+            return float(text)
+
+        # relative to now, like a timeframe: 12h, 7d, 2w
+        if text[-1] in TIMEFRAME_UNITS and text[:-1].isdigit():
+            now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+            return now - pd.Timedelta(minutes=timeframe_to_minutes(text))
+        return pd.Timestamp(text)
+
+    def _filters(self):
+        categories = {}
+        bots = None
+        for input_id, _, col in self.CATEGORY_FILTERS:
+            values = [v.strip() for v in self.query_one(f"#{input_id}").value.split(",")]
+            values = [v for v in values if v]
+            if col is None:
+                bots = values
+            elif values:
+                categories[col] = values
+
+        bounds = {}
+        for input_id, _, col in self.RANGE_FILTERS:
+            bounds[input_id] = self._parse_bound(
+                self.query_one(f"#{input_id}").value, is_date=(col == "Close Date")
+            )
+
+        ranges = {
+            "Close Date": (bounds["search-from"], bounds["search-to"]),
+            "Profit %": (bounds["search-min"], bounds["search-max"]),
+        }
+        return categories, ranges, bots
+
+    @work(group="trade_search_worker", exclusive=True, thread=True)
+    def run_search(self):
+        summary = self.query_one("#search-summary")
+        try:
+            categories, ranges, bots = self._filters()
+        except ValueError as e:
+            self.app.call_from_thread(summary.update, f"[red]Invalid filter: {e}")
+            return
+
+        results = self.app.fleet_index.query(categories, ranges=ranges, bots=bots)
+        profit = sum(df["Profit"].sum() for _, df in results.partitions)
+
+        worker = get_current_worker()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self.show_results, results)
+            self.app.call_from_thread(
+                summary.update,
+                f"{len(results)} trades across {len(results.partitions)} bots, "
+                f"total profit {round(profit, 2)}",
+            )
+
+    def show_results(self, results):
+        table = self.query_one("#search-results")
+        table.set_data(results)
+        if "Close Date" in table.columns:
+            table.sort(table.columns.index("Close Date"), ascending=False)
 
 
 class TradeInfoScreen(BasicModal):
     trade_id: int = "None"
 
     def compose(self) -> ComposeResult:
-        trade_info = self.client.get_trade_info(self.trade_id)
-        main, two, three = self.build_trade_info(trade_info)
-        with Container(main, two, id="info-dialog"):
-            yield Container(three, id="trade-info-orders")
+        with Container(
+            Static("", classes="box", id="trade-info-left"),
+            Static("", classes="box", id="trade-info-right"),
+            id="info-dialog",
+        ):
+            yield Container(
+                Static("", classes="box", id="trade-info-orders-text"), id="trade-info-orders"
+            )
             with Container(id="trade-info-footer"):
                 yield Static("[Esc] to close")
 
+    def on_mount(self) -> None:
+        # show what is cached at once, open trades are then refreshed in the background
+        trade_info = self.client.cached_trade_info(self.trade_id)
+        if trade_info is not None:
+            self.show_trade_info(trade_info)
+        else:
+            self.query_one("#info-dialog").loading = True
+
+        if trade_info is None or trade_info.get("is_open", True):
+            self.load_trade_info()
+
+    @work(group="trade_info_worker", exclusive=True, thread=True)
+    def load_trade_info(self):
+        trade_info = self.client.get_trade_info(self.trade_id)
+
+        worker = get_current_worker()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self.show_trade_info, trade_info)
+
+    def show_trade_info(self, trade_info):
+        try:
+            dialog = self.query_one("#info-dialog")
+            left = self.query_one("#trade-info-left")
+        except NoMatches:
+            # the dialog was closed while the trade was loading
+            return
+
+        dialog.loading = False
+
+        if trade_info is None or "trade_id" not in trade_info:
+            if self.client.cached_trade_info(self.trade_id) is None:
+                left.update(f"[b]Could not retrieve trade {self.trade_id}")
+            return
+
+        main, two, three = self.build_trade_info(trade_info)
+        left.update(main)
+        self.query_one("#trade-info-right").update(two)
+        self.query_one("#trade-info-orders-text").update(three)
+
     def build_trade_info(self, trade_info):
         main_text = (
             f"[b]Trade Id     : {self.trade_id}\n"
@@ -104,8 +249,4 @@ class TradeInfoScreen(BasicModal):
                 f"{o['amount']} | {o['ft_order_tag']}\n"
             )
 
-        main = Static(main_text, classes="box", id="trade-info-left")
-        two = Static(two_text, classes="box", id="trade-info-right")
-        three = Static(three_text, classes="box", id="trade-info-orders")
-
-        return main, two, three
+        return main_text, two_text, three_text
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from rich.segment import Segment
+from rich.style import Style
+from textual import events
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+
+# table that only formats the rows on screen, for frames too large for a DataTable
+class VirtualTable(ScrollView, can_focus=True):
+    DEFAULT_CSS = """
+    VirtualTable {
+        width: 1fr;
+        height: 1fr;
+    }
+    """
+
+    MAX_COLUMN_WIDTH = 40
+    # rows from each end of the data used to size the columns
+    WIDTH_SAMPLE = 200
+
+    header_style = Style(bold=True, reverse=True)
+    row_style = Style()
+    alt_row_style = Style(dim=True)
+
+    def __init__(self, data=None, **kwargs):
+        super().__init__(**kwargs)
+        self.set_data(data if data is not None else pd.DataFrame())
+
+    def set_data(self, data):
+        """Use a DataFrame, or any view with columns, len() and column(name)"""
+        self.columns = [str(c) for c in data.columns]
+        if isinstance(data, pd.DataFrame):
+            self.arrays = [data[c].to_numpy() for c in data.columns]
+        else:
+            self.arrays = [data.column(c) for c in data.columns]
+
+        self.row_count = len(self.arrays[0]) if self.arrays else 0
+        self.order = np.arange(self.row_count)
+        self.sort_indexes = {}
+        self.sort_column = None
+        self.sort_ascending = True
+
+        self.widths = [self._column_width(i) for i in range(len(self.columns))]
+        self.virtual_size = Size(sum(w + 2 for w in self.widths), self.row_count + 1)
+        self.refresh()
+
+    @staticmethod
+    def _format(value) -> str:
+        # show numpy dates and durations the way pandas prints them
+        if isinstance(value, np.datetime64):
+            value = pd.Timestamp(value)
+        elif isinstance(value, np.timedelta64):
+            value = pd.Timedelta(value)
+        return str(value).replace("\n", " ")
+
+    def _column_width(self, col) -> int:
+        values = self.arrays[col]
+        n = self.WIDTH_SAMPLE
+        sample = values if len(values) <= 2 * n else np.concatenate((values[:n], values[-n:]))
+        width = max([len(self.columns[col]) + 2] + [len(self._format(v)) for v in sample])
+        return min(width, self.MAX_COLUMN_WIDTH)
+
+    def _sort_index(self, col) -> np.ndarray:
+        # argsort each column once, later sorts on it are a lookup
+        if col not in self.sort_indexes:
+            values = self.arrays[col]
+            try:
+                index = np.argsort(values, kind="stable")
+            except TypeError:
+                index = np.argsort(values.astype(str), kind="stable")
+            self.sort_indexes[col] = index
+        return self.sort_indexes[col]
+
+    def sort(self, col, ascending=True):
+        index = self._sort_index(col)
+        self.order = index if ascending else index[::-1]
+        self.sort_column = col
+        self.sort_ascending = ascending
+        self.refresh()
+
+    def _cells(self, cells) -> str:
+        return "".join(
+            f" {c[:w].ljust(w)} " for c, w in zip(cells, self.widths)
+        )
+
+    def _header_text(self) -> str:
+        headers = []
+        for i, name in enumerate(self.columns):
+            if i == self.sort_column:
+                name = f"{name} {'▲' if self.sort_ascending else '▼'}"
+            headers.append(name)
+        return self._cells(headers)
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+
+        if y == 0:
+            text, style = self._header_text(), self.header_style
+        else:
+            row = scroll_y + y - 1
+            if row >= self.row_count:
+                return Strip.blank(width, self.rich_style)
+
+            idx = self.order[row]
+            text = self._cells([self._format(values[idx]) for values in self.arrays])
+            style = self.alt_row_style if row % 2 else self.row_style
+
+        strip = Strip([Segment(text, self.rich_style + style)])
+        return strip.crop(scroll_x, scroll_x + width).extend_cell_length(width)
+
+    def on_click(self, event: events.Click) -> None:
+        # clicking a header sorts on that column, clicking it again reverses the order
+        if event.y != 0:
+            return
+
+        x = event.x + self.scroll_offset.x
+        for col, w in enumerate(self.widths):
+            if x < w + 2:
+                ascending = not (col == self.sort_column and self.sort_ascending)
+                self.sort(col, ascending=ascending)
+                return
+            x -= w + 2
@@ -0,0 +1,73 @@
+import pandas as pd
+
+from ftui.ftui_series import (
+    FleetProfitSeries,
+    OpenProfitHistory,
+    higher_timeframes,
+    timeframe_to_minutes,
+)
+
+
+def closed_trades(ids):
+    return pd.DataFrame(
+        {
+            "ID": ids,
+            "Open Date": pd.to_datetime([f"2024-01-0{i}" for i in ids]),
+            "Profit": [1.0] * len(ids),
+        }
+    )
+
+
+def test_cumulative_profit_after_trades_deleted():
+    series = FleetProfitSeries()
+
+    for ids in ([1, 2], [1, 2, 3], [1, 2, 3, 4]):
+        series.update("a", closed_trades(ids))
+        series.cumulative_profit(["a"])
+
+    # trades deleted on the bot reset its bins
+    series.update("a", closed_trades([1, 2]))
+    data = series.cumulative_profit(["a"])
+
+    assert list(data["plot_cumprof"]) == [1.0, 2.0]
+
+
+def test_changed_since_reset():
+    series = FleetProfitSeries()
+    series.update("a", closed_trades([1, 2, 3]))
+    bins = series.bins["a"]
+    version = bins.version
+
+    series.update("a", closed_trades([1]))
+
+    assert bins.version > version
+    assert bins.changed_since(version) == float("-inf")
+
+
+def test_second_and_month_timeframes():
+    assert timeframe_to_minutes("30s") == 0.5
+    assert higher_timeframes("30s")[0] == "5m"
+    assert higher_timeframes("1M") == []
+    assert higher_timeframes("1y") == []
+
+
+def test_fleet_open_profit_leaves_out_failed_and_old_bots():
+    history = OpenProfitHistory(max_age=60)
+    history.update("a", 1000, 5.0)
+    history.update("b", 1000, 3.0)
+    history.update("c", 1000, 2.0)
+
+    # b failed to update, c has not updated for longer than max_age
+    history.drop("b")
+    history.update("a", 1100, 4.0)
+
+    assert history.history().iloc[-1] == 4.0
+
+
+def test_subset_curve_caches_are_bounded():
+    series = FleetProfitSeries()
+    for i in range(20):
+        series.update(f"bot{i}", closed_trades([1, 2]))
+        series.cumulative_profit([f"bot{i}"])
+
+    assert len(series._cache) == FleetProfitSeries.MAX_CACHED_CURVES